@@ -0,0 +1,2 @@
+# celery_app 作为常规包对外暴露：CLI/API 可直接 `from celery_app import tasks`
+# 走标准导入缓存（sys.modules），不必每次 spec_from_file_location 重新执行模块
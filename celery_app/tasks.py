@@ -1,9 +1,18 @@
 from celery import Celery
+from celery.signals import worker_process_init
+from concurrent.futures import ThreadPoolExecutor
+from kombu.serialization import register as _kombu_register
 from pathlib import Path
+import functools
+import inspect
+import logging
 import os
+import random
 import sys
 from typing import Optional, Dict, Any
 
+import orjson
+
 # 允许以项目根目录直接运行 celery worker 时正确解析包
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 SRC = os.path.join(ROOT, "src")
@@ -20,17 +29,18 @@ try:
     from autoscorer.pipeline import run_only, score_only, run_and_score
     from autoscorer.utils.errors import AutoscorerError, make_error
     from autoscorer.utils.errors import maybe_print_exception, make_error_response
-    from autoscorer.utils.task_store import TaskStore
+    from autoscorer.utils.task_store import TaskStore, BufferedTaskStore
+    from autoscorer.utils import dedup as _dedup
 except ImportError as e:
-    logger.error(f"Failed to import autoscorer modules: {e}")
-    logger.error(f"Python path: {sys.path}")
-    logger.error(f"SRC path: {SRC}")
+    logger.error("Failed to import autoscorer modules: %s", e)
+    logger.error("Python path: %s", sys.path)
+    logger.error("SRC path: %s", SRC)
     raise
 
 try:
     cfg = Config()
 except Exception as e:
-    logger.error(f"Failed to load config: {e}")
+    logger.error("Failed to load config: %s", e)
     # 使用默认配置
     class DefaultConfig:
         def get(self, key, default=None):
@@ -46,224 +56,277 @@ celery_app = Celery(
     broker=cfg.get('CELERY_BROKER', 'redis://localhost:6379/0'), 
     backend=cfg.get('CELERY_BACKEND', 'redis://localhost:6379/0')
 )
-_task_store = TaskStore.from_config(cfg)
+# 写合并缓冲：状态更新攒批落库，避免每次转移各付一次 fsync
+_task_store = BufferedTaskStore(TaskStore.from_config(cfg))
+
+# orjson 比 stdlib json 快数倍且直接产出 bytes；任务参数/结果在每个
+# 任务边界都要（反）序列化一次，注册为 kombu 序列化器统一收益。
+# 选项与 API 响应序列化保持一致：裸 orjson.dumps 对 int 键直接抛
+# TypeError，而 stdlib json 会静默转成字符串，评分结果里恰恰常有
+# 这类键（类别ID→指标）和 numpy 标量
+_kombu_register(
+    'orjson',
+    functools.partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+    orjson.loads,
+    content_type='application/x-orjson',
+    content_encoding='binary',
+)
 
 # 配置Celery
 celery_app.conf.update(
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    task_serializer='orjson',
+    accept_content=['orjson', 'json'],  # 兼容旧 producer 的 json 消息
+    result_serializer='orjson',
     timezone='UTC',
     enable_utc=True,
     task_track_started=True,
     task_reject_on_worker_lost=True,
-    worker_send_task_events=True,
-    task_send_sent_event=True,
+    # 任务事件会让每个任务额外写一次 broker（约翻倍 Redis 往返），
+    # 仅在需要 Flower/监控时通过配置开启
+    worker_send_task_events=bool(cfg.get('CELERY_SEND_EVENTS', False)),
+    task_send_sent_event=bool(cfg.get('CELERY_SEND_SENT_EVENTS', False)),
+    # run/score/pipeline 任务为 I/O·容器密集型，单次可运行数秒到数分钟：
+    # prefetch=1 + acks_late 让空闲进程再取任务，避免长任务在忙碌 worker 的
+    # 预取队列里排队（head-of-line blocking）。可通过配置调整。
+    worker_prefetch_multiplier=int(cfg.get('CELERY_PREFETCH_MULTIPLIER', 1)),
+    task_acks_late=bool(cfg.get('CELERY_ACKS_LATE', True)),
 )
 
 
+@worker_process_init.connect
+def _warm_child_process(**_):
+    """prefork 子进程预热：提前导入重依赖并注册自定义评分器。
+
+    docker/k8s SDK 导入要上百毫秒，放到 fork 后立即做，
+    首个任务就不用付这笔冷启动税（对自动扩缩容的 worker 尤其明显）。
+    """
+    try:
+        import autoscorer.executor.docker_executor  # noqa: F401
+        import autoscorer.executor.k8s_executor  # noqa: F401
+        from autoscorer.scorers.registry import load_scorer_directory
+        custom_dir = Path(ROOT) / "custom_scorers"
+        if custom_dir.exists():
+            load_scorer_directory(str(custom_dir))
+    except Exception as e:
+        logger.debug("worker warmup failed: %s", e)
+
+
+# 复用进程级 Session + 连接池：回调多为同一平台地址，复用连接可省去
+# 每次 POST 的 TCP/TLS 握手开销。requests 不可用时一次性回退 urllib。
+try:
+    import requests  # type: ignore
+    from requests.adapters import HTTPAdapter  # type: ignore
+
+    _SESSION = requests.Session()
+    _adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+    _SESSION.mount('http://', _adapter)
+    _SESSION.mount('https://', _adapter)
+except ImportError:  # pragma: no cover - 可选依赖保护
+    _SESSION = None
+
+
 def _http_post_json(url: str, payload: Dict[str, Any], retries: int = 2) -> None:
-    """尽量用 requests 发送，否则回退 urllib。
+    """尽量用 requests（池化 Session）发送，否则回退 urllib。
 
     非关键路径，失败不抛出，只记录日志。
     """
     attempt = 0
     last_err: Exception | None = None
+    # 预序列化一次（orjson 直接产出 bytes），重试时不再重复编码
+    body = orjson.dumps(payload)
+    headers = {'Content-Type': 'application/json'}
     while attempt <= max(0, int(retries)):
-        try:
-            import requests  # type: ignore
-            requests.post(url, json=payload, timeout=5)
-            return
-        except Exception as e:
-            last_err = e
-            logger.debug(f"requests not available or failed (attempt {attempt+1}): {e}")
-        try:
-            import json
-            from urllib import request
-            data = json.dumps(payload).encode('utf-8')
-            req = request.Request(url, data=data, headers={'Content-Type': 'application/json'})
-            with request.urlopen(req, timeout=5) as _:
+        if _SESSION is not None:
+            try:
+                # 连接/读取超时分开：连不上快速失败，读取给足回调处理时间
+                _SESSION.post(url, data=body, headers=headers, timeout=(2, 5))
                 return
-        except Exception as e:
-            last_err = e
-            logger.debug(f"urllib post failed (attempt {attempt+1}): {e}")
-        # backoff
+            except Exception as e:
+                last_err = e
+                logger.debug("requests post failed (attempt %d): %s", attempt + 1, e)
+        else:
+            try:
+                from urllib import request
+                req = request.Request(url, data=body, headers=headers)
+                with request.urlopen(req, timeout=5) as _:
+                    return
+            except Exception as e:
+                last_err = e
+                logger.debug("urllib post failed (attempt %d): %s", attempt + 1, e)
+        # 带抖动的退避，避免多 worker 对同一回调端点同步重试
         attempt += 1
         if attempt <= retries:
             import time
-            time.sleep(min(2 ** attempt, 5))
+            time.sleep(random.uniform(0, min(2 ** attempt, 5)))
     if last_err:
-        logger.warning(f"Callback POST failed after {attempt} attempts: {last_err}")
+        logger.warning("Callback POST failed after %d attempts: %s", attempt, last_err)
 
 
-@celery_app.task(bind=True, name="autoscorer.run_job")
-def run_job(self, workspace: str, backend: str | None = None, callback_url: Optional[str] = None):
-    """执行推理任务"""
+# 回调投递独立成 Celery 任务：重试经 broker 以 countdown 调度，
+# 端点宕机时不占用任何 worker 槽位等待退避
+@celery_app.task(bind=True, max_retries=3, name="autoscorer.deliver_callback")
+def deliver_callback(self, url: str, payload: Dict[str, Any]):
+    """投递回调 POST；失败用去相关抖动的 countdown 重试。"""
+    body = orjson.dumps(payload)
+    headers = {'Content-Type': 'application/json'}
     try:
-        logger.info(f"Starting run_job for workspace: {workspace}")
-        ws = Path(workspace)
-        # 标记 STARTED
-        try:
-            _task_store.upsert(self.request.id, action="run", workspace=str(ws), state="STARTED")
-        except Exception as e:
-            logger.debug(f"task_store upsert start failed: {e}")
-        result = run_only(ws, backend)
-        logger.info(f"Completed run_job for workspace: {workspace}")
-        # 成功回调
-        if callback_url:
-            payload = {"ok": True, "data": {"result": result, "workspace": str(ws)}, "meta": {"task_id": self.request.id}}
-            _http_post_json(callback_url, payload)
-        # 持久化成功
-        try:
-            _task_store.upsert(self.request.id, state="SUCCESS", result={"result": result, "workspace": str(ws)}, finished=True)
-        except Exception as e:
-            logger.debug(f"task_store upsert success failed: {e}")
-        return result
-    except AutoscorerError as e:
-        logger.error(f"AutoscorerError in run_job: {e.code} - {e.message}")
-        error_result = make_error("run", e.code, e.message, details=e.details)
-        self.update_state(state='FAILURE', meta=error_result)
-        ex = Exception(f"{e.code}: {e.message}")
-        maybe_print_exception(ex)
-        if callback_url:
-            payload = make_error_response(e.code, e.message, stage="run")
-            payload["meta"]["task_id"] = self.request.id
-            payload["error"]["details"] = (e.details or {})
-            payload["error"]["details"].update({"workspace": workspace})
-            _http_post_json(callback_url, payload)
-        # 持久化失败
-        try:
-            _task_store.upsert(self.request.id, state="FAILURE", error={"code": e.code, "message": e.message, "details": e.details}, finished=True)
-        except Exception as ex2:
-            logger.debug(f"task_store upsert failure failed: {ex2}")
-        raise ex
+        if _SESSION is not None:
+            resp = _SESSION.post(url, data=body, headers=headers, timeout=(2, 5))
+            resp.raise_for_status()
+        else:
+            from urllib import request
+            req = request.Request(url, data=body, headers=headers)
+            with request.urlopen(req, timeout=5) as _:
+                pass
     except Exception as e:
-        logger.error(f"Unexpected error in run_job: {e}")
-        error_result = make_error("run", "EXEC_ERROR", str(e))
-        self.update_state(state='FAILURE', meta=error_result)
-        maybe_print_exception(e)
-        if callback_url:
-            payload = make_error_response("EXEC_ERROR", str(e), stage="run")
-            payload["meta"]["task_id"] = self.request.id
-            payload["error"]["details"] = {"workspace": workspace}
-            _http_post_json(callback_url, payload)
+        countdown = random.uniform(1, min(2 ** (self.request.retries + 1), 5))
+        raise self.retry(exc=e, countdown=countdown)
+
+
+# broker 不可用时的兜底：回退线程池 fire-and-forget（语义同前，只记日志）
+_CB_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="callback")
+
+
+def _dispatch_callback(url: str, payload: Dict[str, Any]) -> None:
+    """把回调投递为独立任务，任务本体立即返回。"""
+    try:
+        deliver_callback.apply_async((url, payload))
+        return
+    except Exception as e:
+        logger.debug("callback enqueue failed, falling back to thread pool: %s", e)
+    try:
+        _CB_POOL.submit(_http_post_json, url, payload)
+    except Exception as e:  # 线程池关闭等极端情况，降级为同步发送
+        logger.debug("callback pool submit failed, falling back to sync: %s", e)
+        _http_post_json(url, payload)
+
+
+def _mark_started(task_id: str, action: str, workspace: str) -> None:
+    """后台写入 STARTED 状态，不占用任务关键路径。
+
+    每个任务原本要同步写两次 SQLite（STARTED + 终态）；STARTED 仅供观测，
+    读者可容忍毫秒级延迟，改走线程池后关键路径只剩一次终态写入。
+    """
+    def _write():
         try:
-            _task_store.upsert(self.request.id, state="FAILURE", error={"code": "EXEC_ERROR", "message": str(e), "details": {"workspace": workspace}}, finished=True)
-        except Exception as ex2:
-            logger.debug(f"task_store upsert failure failed: {ex2}")
-        raise
+            _task_store.upsert(task_id, action=action, workspace=workspace, state="STARTED")
+        except Exception as e:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("task_store upsert start failed: %s", e)
+
+    try:
+        _CB_POOL.submit(_write)
+    except Exception:
+        _write()
+
+
+@functools.lru_cache(maxsize=2048)
+def _norm_ws(s: str):
+    """缓存 workspace 的 Path 与字符串形态（同一工作区会被反复提交）。"""
+    p = Path(s)
+    return p, str(p)
+
+
+def _with_task_tracking(stage: str, error_code: str):
+    """统一任务生命周期：STARTED 标记、成功/失败回调、结果持久化与异常上报。
+
+    被包装函数保持原始签名，返回 (task_return, persisted_data) 二元组；
+    persisted_data 同时用于成功回调与 TaskStore 落库。
+    """
+    def deco(fn):
+        sig = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            bound = sig.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            workspace = bound.arguments["workspace"]
+            callback_url = bound.arguments.get("callback_url")
+            try:
+                logger.info("Starting %s for workspace: %s", fn.__name__, workspace)
+                _mark_started(self.request.id, stage, _norm_ws(workspace)[1])
+                ret, data = fn(self, *args, **kwargs)
+                logger.info("Completed %s for workspace: %s", fn.__name__, workspace)
+                if callback_url:
+                    payload = {"ok": True, "data": data, "meta": {"task_id": self.request.id}}
+                    _dispatch_callback(callback_url, payload)
+                try:
+                    _task_store.upsert(self.request.id, state="SUCCESS", result=data, finished=True)
+                except Exception as e:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("task_store upsert success failed: %s", e)
+                return ret
+            except AutoscorerError as e:
+                logger.error("AutoscorerError in %s: %s - %s", fn.__name__, e.code, e.message)
+                error_result = make_error(stage, e.code, e.message, details=e.details)
+                self.update_state(state='FAILURE', meta=error_result)
+                ex = Exception(f"{e.code}: {e.message}")
+                maybe_print_exception(ex)
+                if callback_url:
+                    payload = make_error_response(e.code, e.message, stage=stage)
+                    payload["meta"]["task_id"] = self.request.id
+                    payload["error"]["details"] = (e.details or {})
+                    payload["error"]["details"].update({"workspace": workspace})
+                    _dispatch_callback(callback_url, payload)
+                try:
+                    _task_store.upsert(self.request.id, state="FAILURE", error={"code": e.code, "message": e.message, "details": e.details}, finished=True)
+                except Exception as ex2:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("task_store upsert failure failed: %s", ex2)
+                raise ex
+            except Exception as e:
+                logger.error("Unexpected error in %s: %s", fn.__name__, e)
+                error_result = make_error(stage, error_code, str(e))
+                self.update_state(state='FAILURE', meta=error_result)
+                maybe_print_exception(e)
+                if callback_url:
+                    payload = make_error_response(error_code, str(e), stage=stage)
+                    payload["meta"]["task_id"] = self.request.id
+                    payload["error"]["details"] = {"workspace": workspace}
+                    _dispatch_callback(callback_url, payload)
+                try:
+                    _task_store.upsert(self.request.id, state="FAILURE", error={"code": error_code, "message": str(e), "details": {"workspace": workspace}}, finished=True)
+                except Exception as ex2:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("task_store upsert failure failed: %s", ex2)
+                raise
+            finally:
+                # 任务终结（成功或失败）即释放 /submit 的 workspace 去重锁
+                _dedup.release(_norm_ws(workspace)[1], cfg=cfg)
+        return wrapper
+    return deco
+
+
+@celery_app.task(bind=True, name="autoscorer.run_job")
+@_with_task_tracking("run", "EXEC_ERROR")
+def run_job(self, workspace: str, backend: str | None = None, callback_url: Optional[str] = None):
+    """执行推理任务"""
+    ws, ws_str = _norm_ws(workspace)
+    result = run_only(ws, backend)
+    return result, {"result": result, "workspace": ws_str}
 
 
 @celery_app.task(bind=True, name="autoscorer.score_job")
+@_with_task_tracking("score", "SCORE_ERROR")
 def score_job(self, workspace: str, params: dict = None, backend: str | None = None, callback_url: Optional[str] = None):
     """执行评分任务"""
-    try:
-        logger.info(f"Starting score_job for workspace: {workspace}")
-        ws = Path(workspace)
-        try:
-            _task_store.upsert(self.request.id, action="score", workspace=str(ws), state="STARTED")
-        except Exception as e:
-            logger.debug(f"task_store upsert start failed: {e}")
-        # score_only 返回 (Result, Path)
-        result_model, out = score_only(ws, params or {})
-        # pydantic v2 序列化
-        payload = (
-            result_model.model_dump() if hasattr(result_model, "model_dump")
-            else (result_model.dict() if hasattr(result_model, "dict") else result_model)
-        )
-        result = {"result": payload, "output_path": str(out), "workspace": str(ws)}
-        logger.info(f"Completed score_job for workspace: {workspace}")
-        if callback_url:
-            cb = {"ok": True, "data": result, "meta": {"task_id": self.request.id}}
-            _http_post_json(callback_url, cb)
-        try:
-            _task_store.upsert(self.request.id, state="SUCCESS", result=result, finished=True)
-        except Exception as e:
-            logger.debug(f"task_store upsert success failed: {e}")
-        return result
-    except AutoscorerError as e:
-        logger.error(f"AutoscorerError in score_job: {e.code} - {e.message}")
-        error_result = make_error("score", e.code, e.message, details=e.details)
-        self.update_state(state='FAILURE', meta=error_result)
-        ex = Exception(f"{e.code}: {e.message}")
-        maybe_print_exception(ex)
-        if callback_url:
-            payload = make_error_response(e.code, e.message, stage="score")
-            payload["meta"]["task_id"] = self.request.id
-            payload["error"]["details"] = (e.details or {})
-            payload["error"]["details"].update({"workspace": workspace})
-            _http_post_json(callback_url, payload)
-        try:
-            _task_store.upsert(self.request.id, state="FAILURE", error={"code": e.code, "message": e.message, "details": e.details}, finished=True)
-        except Exception as ex2:
-            logger.debug(f"task_store upsert failure failed: {ex2}")
-        raise ex
-    except Exception as e:
-        logger.error(f"Unexpected error in score_job: {e}")
-        error_result = make_error("score", "SCORE_ERROR", str(e))
-        self.update_state(state='FAILURE', meta=error_result)
-        maybe_print_exception(e)
-        if callback_url:
-            payload = make_error_response("SCORE_ERROR", str(e), stage="score")
-            payload["meta"]["task_id"] = self.request.id
-            payload["error"]["details"] = {"workspace": workspace}
-            _http_post_json(callback_url, payload)
-        try:
-            _task_store.upsert(self.request.id, state="FAILURE", error={"code": "SCORE_ERROR", "message": str(e), "details": {"workspace": workspace}}, finished=True)
-        except Exception as ex2:
-            logger.debug(f"task_store upsert failure failed: {ex2}")
-        raise
+    ws, ws_str = _norm_ws(workspace)
+    # score_only 返回 (Result, Path)
+    result_model, out = score_only(ws, params or {})
+    # pydantic v2 序列化：mode='json' 一次性产出 JSON 原生类型，
+    # 回调/落库/返回值边界不再需要二次转换大结果字典
+    payload = (
+        result_model.model_dump(mode='json') if hasattr(result_model, "model_dump")
+        else (result_model.dict() if hasattr(result_model, "dict") else result_model)
+    )
+    result = {"result": payload, "output_path": str(out), "workspace": ws_str}
+    return result, result
 
 
 @celery_app.task(bind=True, name="autoscorer.run_and_score_job")
+@_with_task_tracking("pipeline", "PIPELINE_ERROR")
 def run_and_score_job(self, workspace: str, params: dict = None, backend: str | None = None, callback_url: Optional[str] = None):
     """执行完整流水线任务(推理+评分)"""
-    try:
-        logger.info(f"Starting run_and_score_job for workspace: {workspace}")
-        ws = Path(workspace)
-        try:
-            _task_store.upsert(self.request.id, action="pipeline", workspace=str(ws), state="STARTED")
-        except Exception as e:
-            logger.debug(f"task_store upsert start failed: {e}")
-        result = run_and_score(ws, params or {}, backend)
-        logger.info(f"Completed run_and_score_job for workspace: {workspace}")
-        if callback_url:
-            payload = {"ok": True, "data": {"result": result, "workspace": str(ws)}, "meta": {"task_id": self.request.id}}
-            _http_post_json(callback_url, payload)
-        try:
-            _task_store.upsert(self.request.id, state="SUCCESS", result={"result": result, "workspace": str(ws)}, finished=True)
-        except Exception as e:
-            logger.debug(f"task_store upsert success failed: {e}")
-        return result
-    except AutoscorerError as e:
-        logger.error(f"AutoscorerError in run_and_score_job: {e.code} - {e.message}")
-        error_result = make_error("pipeline", e.code, e.message, details=e.details)
-        self.update_state(state='FAILURE', meta=error_result)
-        ex = Exception(f"{e.code}: {e.message}")
-        maybe_print_exception(ex)
-        if callback_url:
-            payload = make_error_response(e.code, e.message, stage="pipeline")
-            payload["meta"]["task_id"] = self.request.id
-            payload["error"]["details"] = (e.details or {})
-            payload["error"]["details"].update({"workspace": workspace})
-            _http_post_json(callback_url, payload)
-        try:
-            _task_store.upsert(self.request.id, state="FAILURE", error={"code": e.code, "message": e.message, "details": e.details}, finished=True)
-        except Exception as ex2:
-            logger.debug(f"task_store upsert failure failed: {ex2}")
-        raise ex
-    except Exception as e:
-        logger.error(f"Unexpected error in run_and_score_job: {e}")
-        error_result = make_error("pipeline", "PIPELINE_ERROR", str(e))
-        self.update_state(state='FAILURE', meta=error_result)
-        maybe_print_exception(e)
-        if callback_url:
-            payload = make_error_response("PIPELINE_ERROR", str(e), stage="pipeline")
-            payload["meta"]["task_id"] = self.request.id
-            payload["error"]["details"] = {"workspace": workspace}
-            _http_post_json(callback_url, payload)
-        try:
-            _task_store.upsert(self.request.id, state="FAILURE", error={"code": "PIPELINE_ERROR", "message": str(e), "details": {"workspace": workspace}}, finished=True)
-        except Exception as ex2:
-            logger.debug(f"task_store upsert failure failed: {ex2}")
-        raise
+    ws, ws_str = _norm_ws(workspace)
+    result = run_and_score(ws, params or {}, backend)
+    return result, {"result": result, "workspace": ws_str}
@@ -3,7 +3,34 @@
 """
 import pandas as pd
 import numpy as np
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+# pyarrow 的 CSV 解析是多线程 + SIMD 的，且支持列投影；没装则回退 pandas
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+
+def _read_target(path: str) -> np.ndarray:
+    """只读取 target 列，返回 float64 numpy 数组。
+
+    输入文件可能带很多无关列，投影下推可以跳过它们的解析。
+    精度保持 float64：降到 float32 会让上报的指标值发生可见漂移
+    （0.1 变成 0.10000000149…），换 CSV 解析器不能改变评分结果。
+    """
+    if pa is not None:
+        table = pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=['target'],
+                column_types={'target': pa.float64()},
+            ),
+        )
+        return table.column('target').to_numpy(zero_copy_only=False)
+    return pd.read_csv(path, usecols=['target'], dtype={'target': np.float64})['target'].values
+
 
 class CustomMAEScorer:
     """自定义MAE评分器示例"""
@@ -12,15 +39,15 @@ class CustomMAEScorer:
     
     def score(self, gt_path: str, pred_path: str) -> dict:
         """计算MAE分数"""
-        gt_df = pd.read_csv(gt_path)
-        pred_df = pd.read_csv(pred_path)
-        
         # 假设都有'target'列
-        gt_values = gt_df['target'].values
-        pred_values = pred_df['target'].values
-        
-        mae = mean_absolute_error(gt_values, pred_values)
-        
+        gt_values = _read_target(gt_path)
+        pred_values = _read_target(pred_path)
+
+        # 直接用 numpy 融合计算，省掉 sklearn 的输入校验与类型提升开销
+        diff = np.subtract(gt_values, pred_values)
+        np.abs(diff, out=diff)
+        mae = diff.mean()
+
         return {
             'ok': True,
             'summary': {'mae': float(mae)},
@@ -37,22 +64,27 @@ class CustomMAPEScorer:
     
     def score(self, gt_path: str, pred_path: str) -> dict:
         """计算MAPE分数"""
-        gt_df = pd.read_csv(gt_path)
-        pred_df = pd.read_csv(pred_path)
-        
-        gt_values = gt_df['target'].values
-        pred_values = pred_df['target'].values
-        
-        # 避免除零
+        gt_values = _read_target(gt_path)
+        pred_values = _read_target(pred_path)
+
+        # 避免除零；单遍融合计算，省去两次 fancy-index 产生的临时数组
         mask = gt_values != 0
-        mape = np.mean(np.abs((gt_values[mask] - pred_values[mask]) / gt_values[mask])) * 100
-        
+        diff = np.subtract(gt_values, pred_values)
+        np.abs(diff, out=diff)
+        ratio = np.zeros_like(diff)
+        np.divide(diff, gt_values, out=ratio, where=mask)
+        # 真值可为负：比值再取一次绝对值，负真值的行才不会带着符号
+        # 抵消其它行的误差（等价于按 |gt| 相除）
+        np.abs(ratio, out=ratio)
+        valid_samples = int(mask.sum())
+        mape = ratio.sum() / valid_samples * 100 if valid_samples else 0.0
+
         return {
             'ok': True,
             'summary': {'mape': float(mape)},
             'details': {
                 'metric': 'mean_absolute_percentage_error',
                 'samples': len(gt_values),
-                'valid_samples': np.sum(mask)
+                'valid_samples': valid_samples
             }
         }
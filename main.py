@@ -1,10 +1,10 @@
 import sys
 import os
 
+# 支持直接在项目根目录运行 main.py：复用 autoscorer.cli 的 Typer 应用，
+# 命令树只在 cli.py 构建一次，这里仅做 re-export
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
 from autoscorer.cli import app
 
 if __name__ == "__main__":
-    # 支持直接在项目根目录运行 main.py
-    # sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
     app()
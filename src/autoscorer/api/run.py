@@ -1,8 +1,24 @@
 from __future__ import annotations
+import os
 import uvicorn
 
 def main():
-    uvicorn.run("autoscorer.api.server:app", host="0.0.0.0", port=8000, reload=False)
+    # loop/http 为 auto：装有 uvloop/httptools（uvicorn[standard]）时自动启用
+    # libuv 事件循环与 C HTTP 解析器；多 worker 进程提供跨核并行
+    workers = int(os.environ.get("UVICORN_WORKERS", os.cpu_count() or 2))
+    # worker 进程通过环境变量得知实际进程数，server 据此把
+    # MAX_CONCURRENT_RUNS（整机上限）摊成每进程的信号量额度
+    os.environ["AUTOSCORER_API_WORKERS"] = str(workers)
+    uvicorn.run(
+        "autoscorer.api.server:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=False,
+        loop="auto",
+        http="auto",
+        workers=workers,
+        backlog=2048,
+    )
 
 if __name__ == "__main__":
     main()
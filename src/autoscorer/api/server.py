@@ -1,32 +1,76 @@
 from __future__ import annotations
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse as _BaseORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
 from pathlib import Path
 from typing import Optional, Dict, Any, Literal
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from autoscorer.pipeline import run_only, score_only, run_and_score
-# Import scorers package to trigger static registrations on startup
-from autoscorer import scorers as _builtin_scorers  # noqa: F401
 from autoscorer.utils.errors import AutoscorerError, maybe_print_exception
 from autoscorer.utils.config import Config
-from autoscorer.utils.task_store import TaskStore
+from autoscorer.utils.task_store import TaskStore, BufferedTaskStore
+from autoscorer.utils import dedup as _dedup
 from autoscorer.scorers.registry import (
     get_registry, list_scorers, load_scorer_file, reload_scorer_file,
-    start_watching_file, stop_watching_file, get_watched_files
+    start_watching_file, stop_watching_file, get_watched_files,
+    registry_revision, watch_backend, add_reload_listener,
 )
-import importlib.util, os, json
+import anyio.to_thread
+import asyncio, functools, importlib.util, inspect, os, json, sys, threading, time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+
+class ORJSONResponse(_BaseORJSONResponse):
+    """定制 orjson 渲染选项的响应类。
+
+    OPT_SERIALIZE_NUMPY 让自定义 scorer 返回的 numpy 标量/数组直接
+    序列化（无需先 .tolist()）；OPT_NON_STR_KEYS 容忍整型等非字符串键。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
 
 app = FastAPI(
-    title="AutoScorer API", 
+    title="AutoScorer API",
     version="0.1.0",
-    description="AutoScorer REST API for automated scoring and evaluation"
+    description="AutoScorer REST API for automated scoring and evaluation",
+    # orjson 序列化比 stdlib json 快数倍且直接写出 bytes，所有端点统一受益
+    default_response_class=ORJSONResponse,
 )
 
 # 任务结果持久化存储（SQLite）
 _cfg = Config()
-_task_store = TaskStore.from_config(_cfg)
+# 写合并缓冲：突发提交时批量落库，读路径直达 SQLite（WAL 并发读）
+_task_store = BufferedTaskStore(TaskStore.from_config(_cfg))
+
+# 同步的容器执行/评分调用可能阻塞数秒到数分钟，放独立线程池运行，
+# 事件循环（/healthz、/tasks 等）保持响应。容量可经 API_IO_WORKERS 调整。
+_POOL_IO = ThreadPoolExecutor(max_workers=int(_cfg.get("API_IO_WORKERS", 16)), thread_name_prefix="api-io")
+
+
+async def _run_blocking(fn, *args, **kwargs):
+    """在 _POOL_IO 中执行阻塞调用并等待结果。"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_POOL_IO, functools.partial(fn, *args, **kwargs))
+
+# 响应 meta 时间戳缓存：同一毫秒内的响应复用同一个 ISO 字符串，
+# 省去每个响应的 now()+isoformat 开销；不依赖事件循环，任何上下文都正确
+_TS_CACHE: tuple = (0.0, datetime.now(timezone.utc).isoformat())
+
+
+def _now_iso() -> str:
+    global _TS_CACHE
+    t = time.time()
+    last, s = _TS_CACHE
+    if t - last < 0.001:
+        return s
+    s = datetime.fromtimestamp(t, tz=timezone.utc).isoformat()
+    _TS_CACHE = (t, s)
+    return s
 
 
 def make_success_response(data: Any, meta: Optional[Dict] = None) -> Dict:
@@ -35,7 +79,7 @@ def make_success_response(data: Any, meta: Optional[Dict] = None) -> Dict:
         "ok": True,
         "data": data,
         "meta": {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _now_iso(),
             "version": "0.1.0"
         }
     }
@@ -44,6 +88,11 @@ def make_success_response(data: Any, meta: Optional[Dict] = None) -> Dict:
     return response
 
 
+# 错误响应形态固定；details 缺省共享同一个空字典（调用方不会原地修改响应），
+# 失败风暴下少分配一个 dict
+_EMPTY_DETAILS: Dict = {}
+
+
 def make_error_response(code: str, message: str, stage: str = "api", details: Optional[Dict] = None) -> Dict:
     """创建标准化错误响应"""
     return {
@@ -52,10 +101,10 @@ def make_error_response(code: str, message: str, stage: str = "api", details: Op
             "code": code,
             "message": message,
             "stage": stage,
-            "details": details or {}
+            "details": details if details is not None else _EMPTY_DETAILS
         },
         "meta": {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _now_iso(),
             "version": "0.1.0"
         }
     }
@@ -67,6 +116,8 @@ class RunRequest(BaseModel):
     Fields:
     - workspace: 工作区路径（必填）。
     """
+    model_config = ConfigDict(extra="ignore")
+
     workspace: str = Field(..., description="工作区路径，包含 meta.json、input/ 与 output/ 等目录")
 
 
@@ -77,6 +128,8 @@ class ScoreRequest(BaseModel):
     - workspace: 工作区路径（必填）。
     - params: 评分器入参（可选），若不提供则使用默认参数；scorer 从 meta.json 读取。
     """
+    model_config = ConfigDict(extra="ignore")
+
     workspace: str = Field(..., description="工作区路径")
     params: Optional[Dict] = Field(default=None, description="评分器可选参数（覆盖默认值）")
 
@@ -89,6 +142,8 @@ class PipelineRequest(BaseModel):
     - params: 评分阶段参数（可选）。
     说明：backend 与 scorer 均从 workspace/meta.json 解析，不再通过请求体传入。
     """
+    model_config = ConfigDict(extra="ignore")
+
     workspace: str = Field(..., description="工作区路径")
     params: Optional[Dict] = Field(default=None, description="传递给评分阶段的参数（可选）")
 
@@ -103,6 +158,8 @@ class SubmitRequest(BaseModel):
     - callback_url: 回调地址（可选）。
     说明：backend 与 scorer 从 meta.json 解析，不通过该接口传入。
     """
+    model_config = ConfigDict(extra="ignore")
+
     action: Literal["run", "score", "pipeline"] = Field("pipeline", description="任务动作")
     workspace: str = Field(..., description="工作区路径")
     params: Optional[Dict] = Field(default=None, description="评分参数（可选）")
@@ -115,6 +172,124 @@ class TaskStatusResponse(BaseModel):
     result: Optional[Dict] = None
 
 
+# 请求体验证器：启动时编译一次，直接对原始 bytes 做 validate_json，
+# 跳过默认的 json.loads → dict → model 中间环节
+@dataclass(frozen=True)
+class WorkspacePaths:
+    """规范化一次后缓存的工作区路径组合。"""
+    root: Path
+    container_log: Path
+    result_json: Path
+
+
+# 开启 WORKSPACE_ENFORCE_ROOT 后，解析到 WORKSPACE_ROOT 之外的
+# workspace 一律拒绝（挡住路径穿越）；默认关闭以保持兼容
+_WS_ROOT_RESOLVED: Optional[str] = None
+if str(_cfg.get("WORKSPACE_ENFORCE_ROOT", "false")).lower() in ("1", "true", "yes"):
+    try:
+        _WS_ROOT_RESOLVED = str(Path(str(_cfg.get("WORKSPACE_ROOT", "./examples"))).resolve())
+    except OSError:
+        _WS_ROOT_RESOLVED = None
+
+
+# 解析缓存的 TTL：时间分桶进缓存键，过桶即重新 stat 一次，已删除
+# 的工作区最多滞留一个 TTL 窗口；设为 0 可关闭 TTL（永久缓存）
+_WS_CACHE_TTL = float(_cfg.get("WORKSPACE_CACHE_TTL", 2.0))
+
+
+def _resolve_ws(workspace: str) -> WorkspacePaths:
+    epoch = int(time.monotonic() / _WS_CACHE_TTL) if _WS_CACHE_TTL > 0 else 0
+    return _resolve_ws_cached(workspace, epoch)
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_ws_cached(workspace: str, _epoch: int) -> WorkspacePaths:
+    """解析并校验 workspace 路径，成功结果进 LRU 缓存。
+
+    resolve(strict=True) 的 realpath 开销每个 TTL 窗口只付一次；
+    不存在或越界的路径抛异常，不会进缓存（无陈旧否定项）。
+    """
+    p = Path(workspace).resolve(strict=True)
+    if _WS_ROOT_RESOLVED is not None:
+        sp = str(p)
+        if sp != _WS_ROOT_RESOLVED and not sp.startswith(_WS_ROOT_RESOLVED + os.sep):
+            raise PermissionError(f"workspace outside WORKSPACE_ROOT: {p}")
+    return WorkspacePaths(
+        root=p,
+        container_log=p / "logs" / "container.log",
+        result_json=p / "output" / "result.json",
+    )
+
+
+def _dump_result(result):
+    """零中转序列化 Result：pydantic-core 产出 JSON 字节后以
+    orjson.Fragment 原样嵌入外层响应，全程停留在编译代码里，
+    既不先 model_dump 成 dict、也不 loads 回 Python 对象再编码。
+
+    注意：返回值只能放进由 ORJSONResponse 渲染的载荷（本文件所有
+    响应均是），不能交给 stdlib json。"""
+    if hasattr(result, "__pydantic_serializer__"):
+        return orjson.Fragment(result.__pydantic_serializer__.to_json(result))
+    if hasattr(result, "dict"):  # pydantic v1 兼容
+        return result.dict()
+    return result
+
+
+# TypeAdapter 构造即完成 pydantic-core schema 编译（模型类本身默认
+# defer_build=False），因此验证器全部在导入期就绪，首个请求不付
+# schema 构建成本
+_RUN_ADAPTER: TypeAdapter[RunRequest] = TypeAdapter(RunRequest)
+_SCORE_ADAPTER: TypeAdapter[ScoreRequest] = TypeAdapter(ScoreRequest)
+_PIPELINE_ADAPTER: TypeAdapter[PipelineRequest] = TypeAdapter(PipelineRequest)
+_SUBMIT_ADAPTER: TypeAdapter[SubmitRequest] = TypeAdapter(SubmitRequest)
+
+# 仅含常量字段的响应 meta 预构建一份复用，省去每请求一次 dict 分配；
+# make_success_response 只读取 meta（update 进自己的新 dict），共享安全
+_META_LOAD = {"action": "load_scorer"}
+_META_RELOAD = {"action": "reload_scorer"}
+_META_WATCH_START = {"action": "watch_start"}
+_META_WATCH_STOP = {"action": "watch_stop"}
+_META_WATCH_LIST = {"action": "watch_list"}
+_META_GET_RESULT = {"action": "get_result"}
+_META_GET_LOGS = {"action": "get_logs"}
+_META_SUBMIT = {"action": "submit"}
+_META_SUBMIT_DEDUP = {"action": "submit_dedup"}
+_META_TASK_STATUS = {"action": "task_status"}
+
+# /run 与 /pipeline 会拉起容器并占用 CPU/GPU 配额：同时在跑的执行
+# 数以信号量封顶，超出的请求最多排队 RUN_QUEUE_TIMEOUT 秒，仍无空位
+# 则快速返回 429，避免突发流量占满线程池、把算力节点压垮。
+# MAX_CONCURRENT_RUNS 是整机上限，而 asyncio.Semaphore 只在本进程
+# 生效：autoscorer-api 默认起 CPU 数个 uvicorn worker（run.py 把实际
+# worker 数写入 AUTOSCORER_API_WORKERS），这里把上限摊到每个进程，
+# 否则有效并发是 上限×worker数
+_RUN_WORKERS = max(1, int(os.environ.get("AUTOSCORER_API_WORKERS", "1")))
+_RUN_SEM_LIMIT = max(1, int(_cfg.get("MAX_CONCURRENT_RUNS", 4)) // _RUN_WORKERS)
+_RUN_QUEUE_TIMEOUT = float(_cfg.get("RUN_QUEUE_TIMEOUT", 5))
+_RUN_SEM = asyncio.Semaphore(_RUN_SEM_LIMIT)
+
+
+async def _acquire_run_slot() -> Optional[ORJSONResponse]:
+    """占一个执行并发槽位；超时返回 429 响应，成功返回 None。
+
+    调用方拿到 None 后必须在 finally 里 _RUN_SEM.release()。
+    """
+    try:
+        await asyncio.wait_for(_RUN_SEM.acquire(), timeout=_RUN_QUEUE_TIMEOUT)
+        return None
+    except asyncio.TimeoutError:
+        return ORJSONResponse(
+            make_error_response(
+                "RUN_CAPACITY_EXCEEDED",
+                f"Concurrent run limit ({_RUN_SEM_LIMIT}) reached, retry later",
+                "execution",
+                {"max_concurrent_runs": _RUN_SEM_LIMIT},
+            ),
+            status_code=429,
+            headers={"Retry-After": str(max(1, int(_RUN_QUEUE_TIMEOUT)))},
+        )
+
+
 @app.get("/healthz")
 async def healthz():
     """Health check endpoint
@@ -155,7 +330,7 @@ async def api_info():
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     maybe_print_exception(exc)
-    return JSONResponse(
+    return ORJSONResponse(
         make_error_response("UNHANDLED_ERROR", str(exc)),
         status_code=500,
     )
@@ -163,6 +338,21 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 # === Scorer管理API ===
 
+@functools.lru_cache(maxsize=1)
+def _scorers_snapshot(rev: int) -> Dict[str, Any]:
+    """按注册表版本号缓存的 /scorers 响应数据。
+
+    注册表不变时重复请求直接命中快照，不再每次遍历注册表、
+    复制字典；任何注册/注销/监控变化都会递增版本号使快照失效。
+    """
+    scorers = list_scorers()
+    return {
+        "scorers": scorers,
+        "total": len(scorers),
+        "watched_files": get_watched_files()
+    }
+
+
 @app.get("/scorers")
 async def list_available_scorers():
     """List registered scorers
@@ -170,135 +360,146 @@ async def list_available_scorers():
     Response: { scorers, total, watched_files }
     """
     try:
-        scorers = list_scorers()
-        watched_files = get_watched_files()
-        
-        data = {
-            "scorers": scorers,
-            "total": len(scorers),
-            "watched_files": watched_files
-        }
-        
+        data = _scorers_snapshot(registry_revision())
         return make_success_response(data)
     except Exception as e:
         maybe_print_exception(e)
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("LIST_ERROR", str(e), "scorer_management"),
             status_code=500
         )
 
 
-class LoadScorerRequest(BaseModel):
-    file_path: str
-    force_reload: bool = False
-    auto_watch: bool = True
+def _parse_file_path_body(raw: bytes) -> Dict[str, Any]:
+    """管理端点的轻量请求体解析（只需"file_path 是非空字符串"）。
+
+    这些端点的载荷直接透传给 registry，完整的 Pydantic 模型构建在
+    这里只是纯开销；手写校验一次 orjson.loads 即可。
+    """
+    body = orjson.loads(raw)
+    fp = body.get("file_path") if isinstance(body, dict) else None
+    if not isinstance(fp, str) or not fp:
+        raise ValueError("file_path must be a non-empty string")
+    return body
 
 
 @app.post("/scorers/load")
-async def load_scorer(req: LoadScorerRequest):
+async def load_scorer(request: Request):
     """Load a scorer Python file and register scorers defined with @register
 
     Request: { file_path, force_reload?, auto_watch? }
     Response: 加载到的注册名与类名映射。
     """
     try:
-        # 检查文件是否存在
-        if not Path(req.file_path).exists():
-            return JSONResponse(
-                make_error_response("FILE_NOT_FOUND", f"File not found: {req.file_path}", "scorer_loading"),
-                status_code=404
-            )
-            
-        loaded = load_scorer_file(req.file_path, req.force_reload)
-        
+        body = _parse_file_path_body(await request.body())
+        file_path = body["file_path"]
+        force_reload = bool(body.get("force_reload", False))
+        auto_watch = bool(body.get("auto_watch", True))
+    except Exception as e:
+        return ORJSONResponse(
+            make_error_response("INVALID_BODY", str(e), "validation"),
+            status_code=400
+        )
+    try:
+        # 不预先 stat：注册表打开文件时缺失会抛 FileNotFoundError，
+        # 由下方分支统一转 404
+        loaded = load_scorer_file(file_path, force_reload)
+
         # 如果启用自动监控，开始监控文件
-        if req.auto_watch and loaded:
-            start_watching_file(req.file_path)
-        
+        if auto_watch and loaded:
+            start_watching_file(file_path)
+
         data = {
             "loaded_scorers": {name: cls.__name__ for name, cls in loaded.items()},
             "count": len(loaded),
-            "auto_watch": req.auto_watch,
-            "file_path": req.file_path
+            "auto_watch": auto_watch,
+            "file_path": file_path
         }
         
-        return make_success_response(data, {"action": "load_scorer"})
+        return make_success_response(data, _META_LOAD)
         
     except FileNotFoundError as e:
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("FILE_NOT_FOUND", str(e), "scorer_loading"),
             status_code=404
         )
     except Exception as e:
         maybe_print_exception(e)
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("LOAD_ERROR", str(e), "scorer_loading"),
             status_code=500
         )
 
 
 @app.post("/scorers/reload")
-async def reload_scorer(req: LoadScorerRequest):
+async def reload_scorer(request: Request):
     """Reload a scorer Python file and re-register scorers
 
     Request: { file_path }
     Response: 重新加载到的注册名与类名映射。
     """
     try:
-        # 检查文件是否存在
-        if not Path(req.file_path).exists():
-            return JSONResponse(
-                make_error_response("FILE_NOT_FOUND", f"File not found: {req.file_path}", "scorer_reloading"),
-                status_code=404
-            )
-            
-        loaded = reload_scorer_file(req.file_path)
-        
+        body = _parse_file_path_body(await request.body())
+        file_path = body["file_path"]
+    except Exception as e:
+        return ORJSONResponse(
+            make_error_response("INVALID_BODY", str(e), "validation"),
+            status_code=400
+        )
+    try:
+        # 不预先 stat：缺失文件由 FileNotFoundError 分支统一转 404；
+        # 实例缓存经注册表的重载回调失效，此处不再单独处理
+        loaded = reload_scorer_file(file_path)
+
         data = {
             "reloaded_scorers": {name: cls.__name__ for name, cls in loaded.items()},
             "count": len(loaded),
-            "file_path": req.file_path
+            "file_path": file_path
         }
         
-        return make_success_response(data, {"action": "reload_scorer"})
+        return make_success_response(data, _META_RELOAD)
         
     except FileNotFoundError as e:
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("FILE_NOT_FOUND", str(e), "scorer_reloading"),
             status_code=404
         )
     except Exception as e:
         maybe_print_exception(e)
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("RELOAD_ERROR", str(e), "scorer_reloading"),
             status_code=500
         )
 
 
-class WatchFileRequest(BaseModel):
-    file_path: str
-    check_interval: float = 1.0
-
-
 @app.post("/scorers/watch")
-async def start_watch_file(req: WatchFileRequest):
+async def start_watch_file(request: Request):
     """Start watching a file for changes (hot-reload)
 
     Request: { file_path, check_interval? }
     Response: 启动监控的确认信息。
     """
     try:
-        start_watching_file(req.file_path, req.check_interval)
+        body = _parse_file_path_body(await request.body())
+        file_path = body["file_path"]
+        check_interval = float(body.get("check_interval", 1.0))
+    except Exception as e:
+        return ORJSONResponse(
+            make_error_response("INVALID_BODY", str(e), "validation"),
+            status_code=400
+        )
+    try:
+        start_watching_file(file_path, check_interval)
         data = {
-            "message": f"Started watching {req.file_path}",
-            "file_path": req.file_path,
-            "check_interval": req.check_interval
+            "message": f"Started watching {file_path}",
+            "file_path": file_path,
+            "check_interval": check_interval
         }
-        return make_success_response(data, {"action": "watch_start"})
+        return make_success_response(data, _META_WATCH_START)
     except Exception as e:
         maybe_print_exception(e)
-        return JSONResponse(
-            make_error_response("WATCH_ERROR", str(e), "scorer_watch", {"file_path": req.file_path}),
+        return ORJSONResponse(
+            make_error_response("WATCH_ERROR", str(e), "scorer_watch", {"file_path": file_path}),
             status_code=500
         )
 
@@ -316,15 +517,15 @@ async def stop_watch_file(file_path: str):
             return make_success_response({
                 "message": f"Stopped watching {file_path}",
                 "file_path": file_path
-            }, {"action": "watch_stop"})
+            }, _META_WATCH_STOP)
         else:
-            return JSONResponse(
+            return ORJSONResponse(
                 make_error_response("NOT_WATCHING", f"File {file_path} is not being watched", "scorer_watch", {"file_path": file_path}),
                 status_code=404
             )
     except Exception as e:
         maybe_print_exception(e)
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("STOP_WATCH_ERROR", str(e), "scorer_watch", {"file_path": file_path}),
             status_code=500
         )
@@ -334,68 +535,116 @@ async def stop_watch_file(file_path: str):
 async def get_watched_files_api():
     """List watched files
 
-    Response: { watched_files, count }
+    Response: { watched_files, count, backend }
     """
     try:
         watched = get_watched_files()
         data = {
             "watched_files": watched,
-            "count": len(watched)
+            "count": len(watched),
+            # watchfiles=OS 原生事件（空闲零轮询）；polling=mtime 轮询回退
+            "backend": watch_backend()
         }
-        return make_success_response(data, {"action": "watch_list"})
+        return make_success_response(data, _META_WATCH_LIST)
     except Exception as e:
         maybe_print_exception(e)
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("GET_WATCHED_ERROR", str(e), "scorer_watch"),
             status_code=500
         )
 
 
-class TestScorerRequest(BaseModel):
-    scorer_name: str
-    workspace: str
-    params: Optional[Dict] = None
+# /scorers/test 的实例缓存：__init__ 里加载模型/分词器的 scorer
+# 只构造一次，后续调用直接复用（热重载后类对象变化自动换新实例）
+_SCORER_INSTANCES: Dict[type, Any] = {}
+_SCORER_INST_LOCK = threading.Lock()
+
+
+def _get_or_create_instance(scorer_cls: type):
+    with _SCORER_INST_LOCK:
+        inst = _SCORER_INSTANCES.get(scorer_cls)
+        if inst is None:
+            inst = scorer_cls()
+            _SCORER_INSTANCES[scorer_cls] = inst
+        return inst
+
+
+def _evict_instances_from_file(file_path: str) -> None:
+    """丢弃来自指定文件的缓存实例（文件重载后类已失效）。"""
+    target = str(Path(file_path).resolve())
+    with _SCORER_INST_LOCK:
+        stale = []
+        for cls in _SCORER_INSTANCES:
+            try:
+                if str(Path(inspect.getfile(cls)).resolve()) == target:
+                    stale.append(cls)
+            except (TypeError, OSError):
+                continue
+        for cls in stale:
+            inst = _SCORER_INSTANCES.pop(cls)
+            # 给实例释放资源（如 GPU 显存）的机会
+            getattr(inst, "close", lambda: None)()
+
+
+# 经注册表回调失效实例缓存：watcher 触发的重载与 /scorers/load 的
+# force_reload 同样生效，不只覆盖显式 /scorers/reload 端点
+add_reload_listener(_evict_instances_from_file)
 
 
 @app.post("/scorers/test")
-async def test_scorer(req: TestScorerRequest):
+async def test_scorer(request: Request):
     """Run a scorer class directly for a workspace (debug/testing)
 
     Request: { scorer_name, workspace, params? }
     Response: 完整 Result 对象的序列化结果。
     """
+    try:
+        body = orjson.loads(await request.body())
+        scorer_name = body.get("scorer_name") if isinstance(body, dict) else None
+        ws_str = body.get("workspace") if isinstance(body, dict) else None
+        if not isinstance(scorer_name, str) or not scorer_name:
+            raise ValueError("scorer_name must be a non-empty string")
+        if not isinstance(ws_str, str) or not ws_str:
+            raise ValueError("workspace must be a non-empty string")
+        params = body.get("params") or {}
+        if not isinstance(params, dict):
+            raise ValueError("params must be an object")
+    except Exception as e:
+        return ORJSONResponse(
+            make_error_response("INVALID_BODY", str(e), "validation"),
+            status_code=400
+        )
     try:
         from autoscorer.scorers.registry import get_scorer_class
         from pathlib import Path
-        import time
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # 检查scorer是否存在
-        scorer_cls = get_scorer_class(req.scorer_name)
+        scorer_cls = get_scorer_class(scorer_name)
         if scorer_cls is None:
             available_scorers = list_scorers()
-            return JSONResponse(
+            return ORJSONResponse(
                 make_error_response(
                     "SCORER_NOT_FOUND", 
-                    f"Scorer '{req.scorer_name}' not found",
+                    f"Scorer '{scorer_name}' not found",
                     "scorer_testing",
                     {"available_scorers": list(available_scorers.keys())}
                 ),
                 status_code=404
             )
         
-        # 执行scorer
-        workspace = Path(req.workspace)
-        scorer = scorer_cls()
-        result = scorer.score(workspace, req.params or {})
+        # 执行scorer（阻塞计算放线程池，实例按类缓存复用）
+        workspace = Path(ws_str)
+        scorer = _get_or_create_instance(scorer_cls)
+        result = await _run_blocking(scorer.score, workspace, params)
         
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - start_time
         
         # 序列化 Result (兼容 pydantic v1/v2)
-        result_payload = result.model_dump() if hasattr(result, "model_dump") else (result.dict() if hasattr(result, "dict") else result)
+        result_payload = _dump_result(result)
         data = {
-            "scorer_name": req.scorer_name,
+            "scorer_name": scorer_name,
             "scorer_class": scorer_cls.__name__,
             "workspace": str(workspace),
             "result": result_payload  # 完整的Result对象
@@ -404,42 +653,63 @@ async def test_scorer(req: TestScorerRequest):
         meta = {
             "action": "test_scorer",
             "execution_time": execution_time,
-            "scorer_used": req.scorer_name
+            "scorer_used": scorer_name
         }
         
-        return make_success_response(data, meta)
+        return ORJSONResponse(make_success_response(data, meta))
         
     except Exception as e:
         maybe_print_exception(e)
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("TEST_ERROR", str(e), "scorer_testing"),
             status_code=500
         )
 
 
 @app.post("/run")
-async def api_run(req: RunRequest):
+async def api_run(request: Request):
     """Run inference only
 
     Request: { workspace }
     Behavior: backend 从 workspace/meta.json 或系统默认策略解析，本接口不再接收 backend 参数。
     Response: { ok, stage, job_id }
     """
-    import time
-    start_time = time.time()
-
-    # 验证工作区路径
-    ws = Path(req.workspace)
-    if not ws.exists():
-        return JSONResponse(
-            make_error_response("WORKSPACE_NOT_FOUND", f"Workspace not found: {req.workspace}", "validation", {"workspace": str(ws)}),
+    try:
+        req = _RUN_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
+        return ORJSONResponse(
+            make_error_response("VALIDATION_ERROR", str(e), "validation"),
+            status_code=422
+        )
+    start_time = time.perf_counter()
+
+    # 验证工作区路径（解析+校验结果走 LRU 缓存）
+    try:
+        ws = _resolve_ws(req.workspace).root
+    except PermissionError as e:
+        return ORJSONResponse(
+            make_error_response("WORKSPACE_FORBIDDEN", str(e), "validation", {"workspace": req.workspace}),
+            status_code=403
+        )
+    # resolve(strict=True) 对坏路径抛的不止 FileNotFoundError（如
+    # /etc/passwd/foo 抛 NotADirectoryError）：其余 OSError 一律视为
+    # 工作区不存在
+    except OSError:
+        return ORJSONResponse(
+            make_error_response("WORKSPACE_NOT_FOUND", f"Workspace not found: {req.workspace}", "validation", {"workspace": req.workspace}),
             status_code=404
         )
     
+    busy = await _acquire_run_slot()
+    if busy is not None:
+        return busy
     try:
         # backend 由系统策略/配置决定，不通过API传入
-        result = run_only(ws, backend=None)
-        execution_time = time.time() - start_time
+        try:
+            result = await _run_blocking(run_only, ws, backend=None)
+        finally:
+            _RUN_SEM.release()
+        execution_time = time.perf_counter() - start_time
         
         data = {
             "result": result,
@@ -452,7 +722,7 @@ async def api_run(req: RunRequest):
             "backend_used": "auto"
         }
         
-        return make_success_response(data, meta)
+        return ORJSONResponse(make_success_response(data, meta))
         
     except AutoscorerError as e:
         logs_path = str((ws / "logs" / "container.log").resolve())
@@ -463,14 +733,14 @@ async def api_run(req: RunRequest):
             except Exception:
                 pass
         details.update({"logs_path": logs_path, "workspace": str(ws)})
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response(e.code, e.message, "execution", details),
             status_code=400
         )
     except Exception as e:
         logs_path = str((ws / "logs" / "container.log").resolve())
         maybe_print_exception(e)
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("EXEC_ERROR", str(e), "execution", {
                 "logs_path": logs_path,
                 "workspace": str(ws)
@@ -480,30 +750,45 @@ async def api_run(req: RunRequest):
 
 
 @app.post("/score")
-async def api_score(req: ScoreRequest):
+async def api_score(request: Request):
     """Score only
 
     Request: { workspace, params? }
     Behavior: scorer 从 workspace/meta.json 解析，本接口不再接收 scorer 参数。
     Response: { result, output_path, workspace }
     """
-    import time
-    start_time = time.time()
-
-    # 验证工作区路径
-    ws = Path(req.workspace)
-    if not ws.exists():
-        return JSONResponse(
-            make_error_response("WORKSPACE_NOT_FOUND", f"Workspace not found: {req.workspace}", "validation", {"workspace": str(ws)}),
+    try:
+        req = _SCORE_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
+        return ORJSONResponse(
+            make_error_response("VALIDATION_ERROR", str(e), "validation"),
+            status_code=422
+        )
+    start_time = time.perf_counter()
+
+    # 验证工作区路径（解析+校验结果走 LRU 缓存）
+    try:
+        ws = _resolve_ws(req.workspace).root
+    except PermissionError as e:
+        return ORJSONResponse(
+            make_error_response("WORKSPACE_FORBIDDEN", str(e), "validation", {"workspace": req.workspace}),
+            status_code=403
+        )
+    # resolve(strict=True) 对坏路径抛的不止 FileNotFoundError（如
+    # /etc/passwd/foo 抛 NotADirectoryError）：其余 OSError 一律视为
+    # 工作区不存在
+    except OSError:
+        return ORJSONResponse(
+            make_error_response("WORKSPACE_NOT_FOUND", f"Workspace not found: {req.workspace}", "validation", {"workspace": req.workspace}),
             status_code=404
         )
     
     try:
         # scorer 由 meta.json 决定
-        result, output_path = score_only(ws, req.params or {}, scorer_override=None)
-        execution_time = time.time() - start_time
+        result, output_path = await _run_blocking(score_only, ws, req.params or {}, scorer_override=None)
+        execution_time = time.perf_counter() - start_time
         
-        payload = result.model_dump() if hasattr(result, 'model_dump') else (result.dict() if hasattr(result, 'dict') else result)
+        payload = _dump_result(result)
         data = {
             "result": payload,
             "output_path": str(output_path),
@@ -514,7 +799,7 @@ async def api_score(req: ScoreRequest):
             "execution_time": execution_time,
             "scorer_used": "auto"
         }
-        return make_success_response(data, meta)
+        return ORJSONResponse(make_success_response(data, meta))
         
     except AutoscorerError as e:
         details = {}
@@ -524,13 +809,13 @@ async def api_score(req: ScoreRequest):
             except Exception:
                 pass
         details.update({"workspace": str(ws)})
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response(e.code, e.message, "scoring", details),
             status_code=400
         )
     except Exception as e:
         maybe_print_exception(e)
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("SCORE_ERROR", str(e), "scoring", {
                 "workspace": str(ws)
             }),
@@ -539,32 +824,54 @@ async def api_score(req: ScoreRequest):
 
 
 @app.post("/pipeline")
-async def api_pipeline(req: PipelineRequest):
+async def api_pipeline(request: Request):
     """Run inference then score (pipeline)
 
     Request: { workspace, params? }
     Behavior: backend & scorer 从 workspace/meta.json 解析，不再通过API传入。
     Response: { ok, result, result_path } 或标准化错误。
     """
-    import time
-    start_time = time.time()
-
-    # 验证工作区路径
-    ws = Path(req.workspace)
-    if not ws.exists():
-        return JSONResponse(
-            make_error_response("WORKSPACE_NOT_FOUND", f"Workspace not found: {req.workspace}", "validation", {"workspace": str(ws)}),
+    start_time = time.perf_counter()
+
+    try:
+        req = _PIPELINE_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
+        return ORJSONResponse(
+            make_error_response("VALIDATION_ERROR", str(e), "validation"),
+            status_code=422
+        )
+
+    # 验证工作区路径（解析+校验结果走 LRU 缓存）
+    try:
+        ws = _resolve_ws(req.workspace).root
+    except PermissionError as e:
+        return ORJSONResponse(
+            make_error_response("WORKSPACE_FORBIDDEN", str(e), "validation", {"workspace": req.workspace}),
+            status_code=403
+        )
+    # resolve(strict=True) 对坏路径抛的不止 FileNotFoundError（如
+    # /etc/passwd/foo 抛 NotADirectoryError）：其余 OSError 一律视为
+    # 工作区不存在
+    except OSError:
+        return ORJSONResponse(
+            make_error_response("WORKSPACE_NOT_FOUND", f"Workspace not found: {req.workspace}", "validation", {"workspace": req.workspace}),
             status_code=404
         )
 
+    busy = await _acquire_run_slot()
+    if busy is not None:
+        return busy
     try:
         # backend/scorer 由 meta.json 决定
-        result = run_and_score(ws, req.params or {}, backend=None, scorer_override=None)
-        execution_time = time.time() - start_time
+        try:
+            result = await _run_blocking(run_and_score, ws, req.params or {}, backend=None, scorer_override=None)
+        finally:
+            _RUN_SEM.release()
+        execution_time = time.perf_counter() - start_time
         
         # 检查结果中是否有错误
         if isinstance(result, dict) and result.get("error"):
-            return JSONResponse(
+            return ORJSONResponse(
                 make_error_response(
                     result["error"].get("code", "PIPELINE_ERROR"),
                     result["error"].get("message", "Pipeline execution failed"),
@@ -585,8 +892,9 @@ async def api_pipeline(req: PipelineRequest):
             "backend_used": "auto",
             "scorer_used": "auto"
         }
-        
-        return make_success_response(data, meta)
+
+        # 结果载荷可能很大，直接经 ORJSONResponse 序列化，跳过 jsonable_encoder
+        return ORJSONResponse(make_success_response(data, meta))
         
     except AutoscorerError as e:
         logs_path = str((ws / "logs" / "container.log").resolve())
@@ -597,14 +905,14 @@ async def api_pipeline(req: PipelineRequest):
             except Exception:
                 pass
         details.update({"logs_path": logs_path, "workspace": str(ws)})
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response(e.code, e.message, "pipeline", details),
             status_code=400
         )
     except Exception as e:
         logs_path = str((ws / "logs" / "container.log").resolve())
         maybe_print_exception(e)
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("PIPELINE_ERROR", str(e), "pipeline", {
                 "logs_path": logs_path,
                 "workspace": str(ws)
@@ -616,119 +924,307 @@ async def api_pipeline(req: PipelineRequest):
 # 同步结果与日志查询（基于 workspace）
 @app.get("/result")
 async def get_result(workspace: str):
-    ws = Path(workspace)
-    out = ws / "output" / "result.json"
+    try:
+        out = _resolve_ws(workspace).result_json
+    except PermissionError as e:
+        return ORJSONResponse(
+            make_error_response("WORKSPACE_FORBIDDEN", str(e), "score", {"workspace": workspace}),
+            status_code=403
+        )
+    # resolve(strict=True) 对坏路径抛的不止 FileNotFoundError（如
+    # /etc/passwd/foo 抛 NotADirectoryError）：其余 OSError 一律视为
+    # 工作区不存在
+    except OSError:
+        return ORJSONResponse(
+            make_error_response("WORKSPACE_NOT_FOUND", f"Workspace not found: {workspace}", "score", {"workspace": workspace}),
+            status_code=404
+        )
     if not out.exists():
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("RESULT_NOT_FOUND", "result.json not found", "score", {"path": str(out)}),
             status_code=404
         )
     try:
-        data = json.loads(out.read_text())
-        return make_success_response({
-            "result": data,
+        # 文件读取放线程池，避免阻塞事件循环；orjson 直接解析 bytes
+        raw = await anyio.to_thread.run_sync(out.read_bytes)
+        # 解析一遍只为校验文件是合法 JSON；响应里以 Fragment 原样
+        # 嵌入原始字节，整棵结果树不做"loads 再 dumps"的往返
+        orjson.loads(raw)
+        return ORJSONResponse(make_success_response({
+            "result": orjson.Fragment(raw),
             "path": str(out)
-        }, {"action": "get_result"})
+        }, _META_GET_RESULT))
     except Exception as e:
         maybe_print_exception(e)
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("READ_RESULT_ERROR", str(e), "score", {"path": str(out)}),
             status_code=500
         )
 
 
+def _read_log_slice(path: Path, offset: Optional[int], tail: Optional[int]) -> str:
+    """有界读取日志内容（在线程池中执行）。
+
+    - tail=N：从文件尾部按块回扫，只返回末尾 N 行；相比逐行遍历
+      全文件（如 deque(f, maxlen=N)），IO 量只与 N 成正比；
+    - offset=B：从第 B 字节开始读取；
+    - 两者都未给时读取整个文件。
+
+    返回的字符串嵌入 JSON 信封后由 orjson 在原生代码里完成转义，
+    多 MB 日志不会落回 stdlib 编码器的逐字符路径。
+    """
+    if tail is not None and tail > 0:
+        with path.open('rb') as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            data = b''
+            while pos > 0 and data.count(b'\n') <= tail:
+                step = min(64 * 1024, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+            return b'\n'.join(data.splitlines()[-tail:]).decode('utf-8', errors='replace')
+    with path.open('rb') as f:
+        if offset:
+            f.seek(max(0, int(offset)))
+        return f.read().decode('utf-8', errors='replace')
+
+
+# JSON 包装路径的日志体积上限：大文件经 JSON 转义要在内存里保留
+# 2-3 倍文件大小（bytes → str → 转义串），超限时只返回末尾一段并
+# 在 meta 里指引客户端改用 /logs/raw 流式获取全文。
+_LOGS_JSON_MAX_BYTES = int(_cfg.get("LOGS_JSON_MAX_BYTES", 4 * 1024 * 1024))
+
+
 @app.get("/logs")
-async def get_logs(workspace: str):
-    ws = Path(workspace)
-    logf = ws / "logs" / "container.log"
+async def get_logs(request: Request, workspace: str, tail: Optional[int] = None, offset: Optional[int] = None):
+    try:
+        logf = _resolve_ws(workspace).container_log
+    except PermissionError as e:
+        return ORJSONResponse(
+            make_error_response("WORKSPACE_FORBIDDEN", str(e), "run", {"workspace": workspace}),
+            status_code=403
+        )
+    # resolve(strict=True) 对坏路径抛的不止 FileNotFoundError（如
+    # /etc/passwd/foo 抛 NotADirectoryError）：其余 OSError 一律视为
+    # 工作区不存在
+    except OSError:
+        return ORJSONResponse(
+            make_error_response("WORKSPACE_NOT_FOUND", f"Workspace not found: {workspace}", "run", {"workspace": workspace}),
+            status_code=404
+        )
     if not logf.exists():
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("LOG_NOT_FOUND", "container.log not found", "run", {"path": str(logf)}),
             status_code=404
         )
+    # 客户端声明接受纯文本且未要求切片时，直接走 sendfile 流式返回，
+    # 完全绕开"整文件读入内存 + JSON 转义"
+    if tail is None and offset is None:
+        accept = request.headers.get("accept", "")
+        if "text/plain" in accept and "application/json" not in accept:
+            return FileResponse(logf, media_type="text/plain")
     try:
-        return make_success_response({"path": str(logf), "content": logf.read_text()}, {"action": "get_logs"})
+        # container.log 可达数 MB：读取+解码放线程池，且支持 tail/offset 有界读取；
+        # 无界请求超过上限时退化为"末尾一段 + truncated 标记"
+        meta: Dict[str, Any] = _META_GET_LOGS
+        if tail is None and offset is None:
+            size = logf.stat().st_size
+            if size > _LOGS_JSON_MAX_BYTES:
+                offset = size - _LOGS_JSON_MAX_BYTES
+                meta = dict(meta, truncated=True, total_bytes=size, raw_endpoint="/logs/raw")
+        content = await anyio.to_thread.run_sync(_read_log_slice, logf, offset, tail)
+        return ORJSONResponse(make_success_response({"path": str(logf), "content": content}, meta))
     except Exception as e:
         maybe_print_exception(e)
-        return JSONResponse(
+        return ORJSONResponse(
             make_error_response("READ_LOG_ERROR", str(e), "run", {"path": str(logf)}),
             status_code=500
         )
 
 
+@app.get("/logs/raw")
+async def get_logs_raw(workspace: str):
+    """以纯文本直接流式返回 container.log
+
+    Query: workspace
+    Response: text/plain 文件流。多 MB 日志经 JSON 包装要在用户态复制
+    三次（str → JSON → socket）；FileResponse 走 sendfile(2)，内核直接
+    写 socket，内存占用 O(块大小) 且立即开始输出。
+    """
+    try:
+        logf = _resolve_ws(workspace).container_log
+    except PermissionError as e:
+        return ORJSONResponse(
+            make_error_response("WORKSPACE_FORBIDDEN", str(e), "run", {"workspace": workspace}),
+            status_code=403
+        )
+    # resolve(strict=True) 对坏路径抛的不止 FileNotFoundError（如
+    # /etc/passwd/foo 抛 NotADirectoryError）：其余 OSError 一律视为
+    # 工作区不存在
+    except OSError:
+        return ORJSONResponse(
+            make_error_response("WORKSPACE_NOT_FOUND", f"Workspace not found: {workspace}", "run", {"workspace": workspace}),
+            status_code=404
+        )
+    if not logf.exists():
+        return ORJSONResponse(
+            make_error_response("LOG_NOT_FOUND", "container.log not found", "run", {"path": str(logf)}),
+            status_code=404
+        )
+    return FileResponse(logf, media_type="text/plain", filename="container.log")
+
+
 # 异步提交与任务查询（Celery）
 _celery_tasks_module_cache = None
+_celery_tasks_mtime_ns: Optional[int] = None
+# 开发模式下按 mtime 检测 tasks.py 变更并重载；生产路径只导入一次、不再 stat
+_DEV_MODE = str(_cfg.get("DEV_MODE", "false")).lower() in ("1", "true", "yes")
+# 路径在导入时解析一次；加载用双重检查锁，并发首请求不会重复 exec 模块
+_TASKS_PATH = Path(__file__).resolve().parents[3] / "celery_app" / "tasks.py"
+_TASKS_LOCK = threading.Lock()
+
+def _do_load_celery_tasks_module():
+    try:
+        # 项目根目录在 sys.path 上时走常规导入：共享 sys.modules 缓存，
+        # 避免以独立模块对象重复执行 Celery 初始化
+        from celery_app import tasks as module  # type: ignore
+        return module
+    except ImportError:
+        spec = importlib.util.spec_from_file_location("celery_tasks", str(_TASKS_PATH))
+        module = importlib.util.module_from_spec(spec)
+        assert spec and spec.loader
+        spec.loader.exec_module(module)  # type: ignore
+        return module
 
 def _load_celery_tasks_module():
-    global _celery_tasks_module_cache
-    if _celery_tasks_module_cache is not None:
+    global _celery_tasks_module_cache, _celery_tasks_mtime_ns
+    # 无锁快路径：已缓存且非开发模式直接返回
+    if _celery_tasks_module_cache is not None and not _DEV_MODE:
         return _celery_tasks_module_cache
-    root = Path(__file__).resolve().parents[3]
-    tasks_path = root / "celery_app" / "tasks.py"
-    spec = importlib.util.spec_from_file_location("celery_tasks", str(tasks_path))
-    module = importlib.util.module_from_spec(spec)
-    assert spec and spec.loader
-    spec.loader.exec_module(module)  # type: ignore
-    _celery_tasks_module_cache = module
-    return module
+    with _TASKS_LOCK:
+        if _celery_tasks_module_cache is not None:
+            if not _DEV_MODE:
+                return _celery_tasks_module_cache
+            # 仅在文件真的变了时才失效导入缓存并重新执行
+            try:
+                mtime_ns = _TASKS_PATH.stat().st_mtime_ns
+            except OSError:
+                return _celery_tasks_module_cache
+            if mtime_ns == _celery_tasks_mtime_ns:
+                return _celery_tasks_module_cache
+            importlib.invalidate_caches()
+            sys.modules.pop("celery_tasks", None)
+            sys.modules.pop("celery_app.tasks", None)
+        module = _do_load_celery_tasks_module()
+        if _DEV_MODE:
+            try:
+                _celery_tasks_mtime_ns = _TASKS_PATH.stat().st_mtime_ns
+            except OSError:
+                _celery_tasks_mtime_ns = None
+        _celery_tasks_module_cache = module
+        return module
 
 
-@app.post("/submit")
-async def submit_job(req: SubmitRequest):
-    """Submit an async job via Celery
+# action → Celery 任务名（稳定名提交，避免导入名不一致），模块级
+# 构建一次；args 组装用分支函数取代每请求重建的 dict-of-tuples
+_TASK_NAMES = {
+    "run": "autoscorer.run_job",
+    "score": "autoscorer.score_job",
+    "pipeline": "autoscorer.run_and_score_job",
+}
+_DEFAULT_TASK_NAME = "autoscorer.run_and_score_job"
 
-    Request: { action, workspace, params?, callback_url? }
-    Behavior: backend & scorer 从 meta.json 解析；此处仅提交任务。
-    Response: { submitted, task_id, action, workspace }（若去重则返回 running=true 和已有 task_id）。
-    """
+
+def _build_task_args(task_name: str, ws: str, params: Optional[Dict], callback_url: Optional[str]) -> tuple:
+    if task_name == "autoscorer.run_job":
+        return (ws, None, callback_url)
+    # score 与 pipeline 签名一致：(workspace, params, override, callback)
+    return (ws, params or {}, None, callback_url)
+
+
+def _submit_job_sync(req: SubmitRequest) -> Dict:
+    """去重检查与任务投递（Redis/SQLite/broker 均为阻塞 IO，线程池执行）。"""
     mod = _load_celery_tasks_module()
-    ws = str(Path(req.workspace))
+    # 规范化 workspace：同一工作区的不同写法（相对/含 ../ 或符号链接）
+    # 映射到同一去重键，既不漏判也不把前缀相同的不同工作区误判为同一个
+    try:
+        ws = str(Path(req.workspace).resolve())
+    except OSError:
+        ws = str(Path(req.workspace))
     action = req.action.lower()
-    # 去重：同一 workspace 正在运行则直接返回正在运行的任务ID
-    existing_id: Optional[str] = None
-    try:
-        insp = mod.celery_app.control.inspect()
-        active = insp.active() or {}
-        for worker, tasks in (active or {}).items():
-            for t in tasks or []:
-                # 任务名可能是 celery_app.tasks.<func>
-                args = t.get("argsrepr") or ""
-                if ws in args:
-                    existing_id = t.get("id")
-                    break
-            if existing_id:
-                break
-    except Exception as e:
-        # 忽略去重检查错误，但打印堆栈（可选）
-        maybe_print_exception(e)
-
-    if existing_id:
+    # 去重：同一 workspace 正在运行则直接返回正在运行的任务ID。
+    # Redis SET NX 单次往返完成判断+占锁，取代 inspect().active()
+    # 向全部 worker 广播并逐任务扫描 argsrepr 的做法
+    dedup_ttl = int(_cfg.get("SUBMIT_DEDUP_TTL", _dedup.DEFAULT_TTL))
+    acquired, existing_id = _dedup.acquire(ws, ttl=dedup_ttl, cfg=_cfg)
+    if acquired and _dedup.get_client(_cfg) is None:
+        # Redis 不可用时回退到本地 SQLite 索引查询（O(1) 索引命中，
+        # 不再向所有 worker 广播 inspect().active()）
+        try:
+            existing_id = _task_store.get_running_by_workspace(ws, max_age_s=dedup_ttl)
+            acquired = existing_id is None
+        except Exception as e:
+            maybe_print_exception(e)
+
+    if not acquired:
         data = {"submitted": False, "running": True, "task_id": existing_id, "action": action, "workspace": ws}
-        return make_success_response(data, {"action": "submit_dedup"})
-    # 通过稳定的任务名提交，避免导入名导致的不一致
-    task_name_map = {
-        "run": "autoscorer.run_job",
-        "score": "autoscorer.score_job",
-        "pipeline": "autoscorer.run_and_score_job",
-    }
-    task_name = task_name_map.get(action, "autoscorer.run_and_score_job")
-    args = {
-        "autoscorer.run_job": (ws, None, req.callback_url),
-        "autoscorer.score_job": (ws, req.params or {}, None, req.callback_url),
-        "autoscorer.run_and_score_job": (ws, req.params or {}, None, req.callback_url),
-    }[task_name]
-    async_result = mod.celery_app.send_task(task_name, args=args)
+        return make_success_response(data, _META_SUBMIT_DEDUP)
+    task_name = _TASK_NAMES.get(action, _DEFAULT_TASK_NAME)
+    args = _build_task_args(task_name, ws, req.params, req.callback_url)
+    try:
+        async_result = mod.celery_app.send_task(task_name, args=args)
+    except Exception:
+        # broker 投递失败：立即释放刚占下的去重锁，否则该 workspace 在
+        # TTL 内一直被"pending"占位锁住，后续提交全部被误判为正在运行
+        try:
+            _dedup.release(ws, cfg=_cfg)
+        except Exception as e:
+            maybe_print_exception(e)
+        raise
+    # 锁值从占位符换成实际任务ID，供后续去重命中时返回
+    _dedup.bind(ws, async_result.id, ttl=dedup_ttl, cfg=_cfg)
     data = {"submitted": True, "task_id": async_result.id, "action": action, "workspace": ws}
     # 持久化初始状态
     try:
         _task_store.upsert(async_result.id, action=action, workspace=ws, state="SUBMITTED", result=None, error=None)
     except Exception as e:
         maybe_print_exception(e)
-    return make_success_response(data, {"action": "submit"})
+    return make_success_response(data, _META_SUBMIT)
 
 
-@app.get("/tasks/{task_id}")
-async def get_task_status(task_id: str):
+@app.post("/submit")
+async def submit_job(request: Request):
+    """Submit an async job via Celery
+
+    Request: { action, workspace, params?, callback_url? }
+    Behavior: backend & scorer 从 meta.json 解析；此处仅提交任务。
+    Response: { submitted, task_id, action, workspace }（若去重则返回 running=true 和已有 task_id）。
+    """
+    try:
+        req = _SUBMIT_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
+        return ORJSONResponse(
+            make_error_response("VALIDATION_ERROR", str(e), "validation"),
+            status_code=422
+        )
+    return await _run_blocking(_submit_job_sync, req)
+
+
+def _task_status_sync(task_id: str) -> Dict[str, Any]:
+    """查询任务状态（结果后端/SQLite 均为阻塞 IO，在线程池中执行）。"""
+    # 终态任务直接读本地 SQLite：已完成的任务状态不会再变，
+    # 不必每次轮询都往 Celery 结果后端（Redis）跑一个往返
+    try:
+        stored = _task_store.get(task_id)
+    except Exception:
+        stored = None
+    if stored and stored.get("finished_at") and stored.get("state") in _TERMINAL_STATES:
+        return {
+            "id": task_id,
+            "state": stored["state"],
+            "result": stored.get("result") or stored.get("error"),
+        }
     mod = _load_celery_tasks_module()
     async_result = mod.celery_app.AsyncResult(task_id)
     resp = {"id": task_id, "state": async_result.state}
@@ -760,7 +1256,138 @@ async def get_task_status(task_id: str):
                 })
     except Exception as e:
         resp["result"] = {"error": str(e)}
-    return make_success_response(resp, {"action": "task_status"})
+    return resp
+
+
+@app.get("/tasks/{task_id}")
+async def get_task_status(task_id: str):
+    resp = await _run_blocking(_task_status_sync, task_id)
+    return ORJSONResponse(make_success_response(resp, _META_TASK_STATUS))
+
+
+_TERMINAL_STATES = {"SUCCESS", "FAILURE", "REVOKED"}
+
+
+def _sse_chunk(obj: Dict[str, Any]) -> bytes:
+    return b"data: " + orjson.dumps(obj) + b"\n\n"
+
+
+# SSE 订阅用异步 Redis 客户端：同步生成器每次 next() 都阻塞约 1s，
+# 而 Starlette 在 anyio 默认线程池（容量 40）里迭代同步生成器，几十
+# 个空闲订阅者就会占满它，连带拖住走同一线程池的其它端点
+try:
+    import redis.asyncio as _aioredis
+except ImportError:  # pragma: no cover - 可选依赖保护
+    _aioredis = None
+
+_aio_redis_client = None
+
+
+def _get_aio_redis():
+    """惰性创建进程级异步 Redis 客户端（与去重锁共用 broker 地址）。"""
+    global _aio_redis_client
+    if _aio_redis_client is None and _aioredis is not None:
+        url = "redis://localhost:6379/0"
+        try:
+            url = _cfg.get("CELERY_BROKER", url)
+        except Exception:
+            pass
+        try:
+            _aio_redis_client = _aioredis.Redis.from_url(url)
+        except Exception:
+            return None
+    return _aio_redis_client
+
+
+async def _task_event_stream(task_id: str):
+    """SSE 事件生成器（异步迭代，空闲等待只挂起协程、不占线程）。
+
+    订阅 Celery Redis 结果后端对 celery-task-meta-{id} 的 PUBLISH，
+    状态变化即推送，客户端无需每 500ms 轮询一次 /tasks/{id}；
+    Redis 不可用时回退为服务端 1s 间隔长轮询。状态查询是短阻塞
+    调用，走 _POOL_IO。
+    """
+    mod = _load_celery_tasks_module()
+
+    def _query_state():
+        return mod.celery_app.AsyncResult(task_id).state
+
+    def _query_result():
+        return mod.celery_app.AsyncResult(task_id).result
+
+    try:
+        state = await _run_blocking(_query_state)
+    except Exception as e:
+        maybe_print_exception(e)
+        yield _sse_chunk({"id": task_id, "state": "UNKNOWN", "error": str(e)})
+        return
+    yield _sse_chunk({"id": task_id, "state": state})
+    if state in _TERMINAL_STATES:
+        return
+
+    pubsub = None
+    r = _get_aio_redis()
+    if r is not None:
+        try:
+            pubsub = r.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(f"celery-task-meta-{task_id}")
+        except Exception:
+            pubsub = None
+    timeout = float(_cfg.get("TASK_EVENTS_TIMEOUT", 3600))
+    deadline = time.time() + timeout
+    try:
+        # 订阅与首次查询之间可能已经完成，订阅后补查一次
+        state = await _run_blocking(_query_state)
+        if state in _TERMINAL_STATES:
+            res = await _run_blocking(_query_result)
+            yield _sse_chunk({"id": task_id, "state": state, "result": res if isinstance(res, dict) else None})
+            return
+        while time.time() < deadline:
+            if pubsub is not None:
+                msg = await pubsub.get_message(timeout=1.0)
+                if not msg or msg.get("type") != "message":
+                    continue
+                try:
+                    meta = orjson.loads(msg["data"])
+                    state = meta.get("status") or await _run_blocking(_query_state)
+                    payload = {"id": task_id, "state": state, "result": meta.get("result")}
+                except Exception:
+                    state = await _run_blocking(_query_state)
+                    payload = {"id": task_id, "state": state}
+                yield _sse_chunk(payload)
+                if state in _TERMINAL_STATES:
+                    return
+            else:
+                # 长轮询回退：后端不支持 pub/sub 时 1s 间隔查询
+                await asyncio.sleep(1.0)
+                new_state = await _run_blocking(_query_state)
+                if new_state == state:
+                    continue
+                state = new_state
+                payload = {"id": task_id, "state": state}
+                if state in _TERMINAL_STATES:
+                    res = await _run_blocking(_query_result)
+                    payload["result"] = res if isinstance(res, dict) else None
+                yield _sse_chunk(payload)
+                if state in _TERMINAL_STATES:
+                    return
+    finally:
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+
+@app.get("/tasks/{task_id}/events")
+async def task_events(task_id: str):
+    """以 Server-Sent Events 推送任务状态变化
+
+    Response: text/event-stream，每次状态转移推送一条
+    data: {"id", "state", "result?"}，任务终态后关闭流。
+    轮询端点 /tasks/{task_id} 保留用于兼容。
+    """
+    return StreamingResponse(_task_event_stream(task_id), media_type="text/event-stream")
 
 
 # for `uvicorn autoscorer.api.server:app --reload`
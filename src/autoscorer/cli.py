@@ -1,29 +1,79 @@
 from pathlib import Path
 from typing import Optional, Dict, Any
-import json
+import functools
+import orjson
+import os
+import sys
 import typer
-from rich import print
+from rich import print as rich_print
 from datetime import datetime, timezone
 import time
 
-from autoscorer.schemas.job import JobSpec
-from autoscorer.schemas.result import Result
-from autoscorer.executor.docker_executor import DockerExecutor
-from autoscorer.scheduler import Scheduler
-# Ensure built-in scorers are registered via package import side-effect
-from autoscorer import scorers as _builtin_scorers  # noqa: F401
-from autoscorer.scorers.registry import get_scorer
-from autoscorer.utils.errors import make_error, AutoscorerError
-from autoscorer.pipeline import run_and_score as pipeline_run_and_score
+# 重量级模块（pipeline/执行器/schemas，连带 docker SDK 与 pydantic
+# 模型构建）全部推迟到具体命令体内导入：--help、validate、config 等
+# 轻命令的启动不再为用不到的依赖买单
+from autoscorer.utils.errors import AutoscorerError
+
+
+def _loads(s: str):
+    """解析 CLI 传入的 JSON 参数（orjson，Rust 实现）。"""
+    return orjson.loads(s)
+
+
+def _dumps(o: Any) -> str:
+    # OPT_UTC_Z：datetime 对象由 orjson 在原生代码里直接格式化成
+    # RFC3339（Z 后缀），响应时间戳不再走 Python 层 isoformat()
+    return orjson.dumps(o, option=_JSON_OPTS).decode()
+
+
+# 默认输出紧凑 JSON（脚本/CI 友好，序列化走 orjson 原生代码）；
+# --pretty 或 AUTOSCORER_PRETTY=1 时才走 rich 的反射式彩色打印
+_PRETTY = os.environ.get("AUTOSCORER_PRETTY") == "1"
+
+_JSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+
+def _emit(payload: Dict) -> None:
+    if _PRETTY:
+        # 人类模式走一次 JSON 往返，把 datetime/Fragment 等序列化期
+        # 才展开的值归一成纯结构再交给 rich（此路径不在性能热区）
+        rich_print(orjson.loads(_dumps(payload)))
+        return
+    # orjson 产出的 bytes 直接写 stdout 缓冲，不经过 str 解码再编码
+    buf = getattr(sys.stdout, "buffer", None)
+    if buf is not None:
+        buf.write(orjson.dumps(payload, option=_JSON_OPTS))
+        buf.write(b"\n")
+        buf.flush()
+    else:  # stdout 被替换成纯文本流时（如部分测试环境）
+        sys.stdout.write(_dumps(payload) + "\n")
+
+
+def _result_payload(result):
+    """单趟序列化 Result：pydantic-core 直接产出 JSON 字节，经
+    orjson.Fragment 原样嵌入输出，不再先 model_dump 成 dict。"""
+    if hasattr(result, "__pydantic_serializer__"):
+        return orjson.Fragment(result.__pydantic_serializer__.to_json(result))
+    if hasattr(result, "dict"):  # pydantic v1 兼容
+        return result.dict()
+    return result
+
+
+# 响应骨架模板：copy() 一个扁平 dict 比重建字面量便宜（不重哈希
+# 键、单次分配），监控/重载等长会话里每条输出都省一点。
+# 没有进一步换成 slots dataclass：orjson 原生序列化 dataclass 时无法
+# 把 **kwargs 扩展字段平铺到顶层（会多嵌一层 extras 键，改变输出
+# 契约），而自定义 default 回调又会抵消掉省下的开销
+_OK_TEMPLATE = {"status": "success", "data": None, "timestamp": None}
+_ERR_TEMPLATE = {"status": "error", "error": None, "timestamp": None}
 
 
 def make_cli_success(data: Any, execution_time: Optional[float] = None, **kwargs) -> Dict:
     """创建CLI标准化成功输出"""
-    result = {
-        "status": "success",
-        "data": data,
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    }
+    result = _OK_TEMPLATE.copy()
+    result["data"] = data
+    # 保留为 datetime 对象，序列化交给 orjson（见 _dumps）
+    result["timestamp"] = datetime.now(timezone.utc)
     if execution_time is not None:
         result["execution_time"] = execution_time
     result.update(kwargs)
@@ -32,17 +82,12 @@ def make_cli_success(data: Any, execution_time: Optional[float] = None, **kwargs
 
 def make_cli_error(code: str, message: str, stage: str = "cli", details: Optional[Dict] = None, **kwargs) -> Dict:
     """创建CLI标准化错误输出"""
-    payload = {
-        "status": "error",
-        "error": {
-            "code": code,
-            "message": message,
-            "stage": stage
-        },
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    }
+    payload = _ERR_TEMPLATE.copy()
+    err = {"code": code, "message": message, "stage": stage}
     if details is not None:
-        payload["error"]["details"] = details
+        err["details"] = details
+    payload["error"] = err
+    payload["timestamp"] = datetime.now(timezone.utc)
     if kwargs:
         payload.update(kwargs)
     return payload
@@ -57,344 +102,416 @@ app = typer.Typer(
     no_args_is_help=True
 )
 
+
+@app.callback()
+def _global_options(
+    # 默认值取自 AUTOSCORER_PRETTY：callback 每次都会执行，写死 False
+    # 会把模块级按环境变量算好的 _PRETTY 覆盖掉
+    pretty: bool = typer.Option(_PRETTY, "--pretty", help="彩色结构化输出（默认为紧凑 JSON）"),
+):
+    global _PRETTY
+    _PRETTY = pretty
+
+
+# celery_app/tasks.py 动态加载一次后缓存：重复 submit 不再重新
+# 解析和执行整个任务模块（连带 Celery app 初始化）
+_CELERY_TASKS = None
+
+
+# 共享的 typer.Option/Argument 哨兵对象：帮助文本与默认值只构建一份，
+# 多个命令签名直接引用
+_ACTION_OPT = typer.Option("run", help="执行动作: run|score|pipeline")
+_BACKEND_OPT = typer.Option("docker", help="执行后端: docker|k8s|auto")
+_PARAMS_OPT = typer.Option(None, help="JSON字符串，评分器参数")
+_SCORER_OPT = typer.Option(None, help="指定使用的评分器名称")
+_FILE_PATH_OPT = typer.Option(None, help="Python评分器文件路径")
+_SCORER_NAME_OPT = typer.Option(None, help="评分器名称")
+_TEST_WS_OPT = typer.Option(None, help="测试工作空间路径")
+_CONFIG_PATH_OPT = typer.Option(None, help="自定义配置文件路径")
+
+
+# action → Celery 任务名；模块级构建一次，submit 不再每次重建
+_TASK_NAMES = {
+    "run": "autoscorer.run_job",
+    "score": "autoscorer.score_job",
+    "pipeline": "autoscorer.run_and_score_job",
+}
+
+
+def _build_task_args(task_name: str, ws: str, p: Dict) -> tuple:
+    if task_name == "autoscorer.run_job":
+        return (ws, None, None)
+    # score 与 pipeline 签名一致：(workspace, params, override, callback)
+    return (ws, p, None, None)
+
+
+def _get_celery_tasks():
+    global _CELERY_TASKS
+    if _CELERY_TASKS is None:
+        try:
+            # 项目根目录在 sys.path 上时走常规导入：共享 sys.modules
+            # 缓存与标准 finder（PEP 451），不重复执行 Celery 初始化
+            from celery_app import tasks as module  # type: ignore
+        except ImportError:
+            spec = importlib.util.spec_from_file_location(
+                "celery_tasks",
+                str(Path(__file__).parent.parent.parent / "celery_app" / "tasks.py"))
+            module = importlib.util.module_from_spec(spec)
+            # 先登记进 sys.modules，模块内部的相对导入不会触发二次加载
+            sys.modules["celery_tasks"] = module
+            spec.loader.exec_module(module)
+        _CELERY_TASKS = module
+    return _CELERY_TASKS
+
 @app.command()
 def submit(workspace: str, 
-           action: str = typer.Option("run", help="执行动作: run|score|pipeline"), 
-           params: Optional[str] = typer.Option(None, help="JSON字符串，评分器参数")):
+           action: str = _ACTION_OPT, 
+           params: Optional[str] = _PARAMS_OPT):
     """提交异步任务到 Celery 队列"""
     try:
+        # str(ws) 只算一次：Path.__str__ 每次都重新拼接 parts
         ws = Path(workspace)
+        ws_str = str(ws)
         if not ws.exists():
-            print(make_cli_error("WORKSPACE_NOT_FOUND", f"Workspace not found: {workspace}", "validation", {"workspace": str(ws)}))
+            _emit(make_cli_error("WORKSPACE_NOT_FOUND", f"Workspace not found: {workspace}", "validation", {"workspace": ws_str}))
             return
             
         # 解析参数
         try:
-            p = json.loads(params) if params else {}
-        except json.JSONDecodeError as e:
-            print(make_cli_error("INVALID_PARAMS", f"Invalid JSON params: {str(e)}", "validation", {"params": params}))
+            p = _loads(params) if params else {}
+        except orjson.JSONDecodeError as e:
+            _emit(make_cli_error("INVALID_PARAMS", f"Invalid JSON params: {str(e)}", "validation", {"params": params}))
             return
             
-        # 动态导入 celery_app.tasks
-        spec = importlib.util.spec_from_file_location(
-            "celery_tasks",
-            str(Path(__file__).parent.parent.parent / "celery_app" / "tasks.py"))
-        celery_tasks = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(celery_tasks)
-        
-        task_name_map = {
-            "run": "autoscorer.run_job",
-            "score": "autoscorer.score_job",
-            "pipeline": "autoscorer.run_and_score_job",
-        }
-        if action not in task_name_map:
-            print(make_cli_error("INVALID_ACTION", f"Invalid action '{action}'. Use: run|score|pipeline", "validation"))
+        # 动态导入 celery_app.tasks（模块级缓存，仅首次执行）
+        celery_tasks = _get_celery_tasks()
+
+        task_name = _TASK_NAMES.get(action)
+        if task_name is None:
+            _emit(make_cli_error("INVALID_ACTION", f"Invalid action '{action}'. Use: run|score|pipeline", "validation"))
             return
-        task_name = task_name_map[action]
-        args_map = {
-            "autoscorer.run_job": (str(ws), None, None),
-            "autoscorer.score_job": (str(ws), p, None, None),
-            "autoscorer.run_and_score_job": (str(ws), p, None, None),
-        }
-        result = celery_tasks.celery_app.send_task(task_name, args=args_map[task_name])
+        result = celery_tasks.celery_app.send_task(task_name, args=_build_task_args(task_name, ws_str, p))
         data = {"submitted": True, "task_id": result.id, "action": action, "params": p}
-            
-        print(make_cli_success(data, workspace=str(ws)))
+
+        _emit(make_cli_success(data, workspace=ws_str))
         
     except Exception as e:
-        print(make_cli_error("SUBMIT_ERROR", str(e), "async_submission", {"workspace": workspace}))
+        _emit(make_cli_error("SUBMIT_ERROR", str(e), "async_submission", {"workspace": workspace}))
 
 
 @app.command()
 def validate(workspace: str):
     """验证工作区结构与 meta.json 配置文件"""
     try:
+        # 不预先 stat：meta.json 缺失由 FileNotFoundError 分支统一处理
         ws = Path(workspace)
-        if not ws.exists():
-            print(make_cli_error("WORKSPACE_NOT_FOUND", f"Workspace not found: {workspace}", "validation", {"workspace": str(ws)}))
-            return
-            
+        ws_str = str(ws)
+        from autoscorer.schemas.job import JobSpec
         spec = JobSpec.from_workspace(ws)
         data = {
-            "validated": True, 
-            "job_id": spec.job_id, 
+            "validated": True,
+            "job_id": spec.job_id,
             "task_type": spec.task_type,
-            "workspace_path": str(ws.resolve())
+            # abspath 纯字符串运算即可满足展示需要；resolve() 会逐级
+            # stat 解析符号链接，网络文件系统上明显更慢
+            "workspace_path": os.path.abspath(ws_str)
         }
-        print(make_cli_success(data, workspace=str(ws)))
+        _emit(make_cli_success(data, workspace=ws_str))
+    except FileNotFoundError as e:
+        _emit(make_cli_error("WORKSPACE_NOT_FOUND", str(e), "validation", {"workspace": workspace}))
     except Exception as e:
-        print(make_cli_error("VALIDATION_ERROR", str(e), "validation", {"workspace": workspace}))
+        _emit(make_cli_error("VALIDATION_ERROR", str(e), "validation", {"workspace": workspace}))
 
 
-@app.command()
-def run(workspace: str, backend: str = typer.Option("docker", help="执行后端: docker|k8s|auto")):
-    """执行推理容器，生成预测结果（不包含评分）"""
-    start_time = time.time()
-    try:
-        ws = Path(workspace)
-        if not ws.exists():
-            print(make_cli_error("WORKSPACE_NOT_FOUND", f"Workspace not found: {workspace}", "validation", {"workspace": str(ws)}))
-            return
-            
-        from autoscorer.pipeline import run_only
-        
-        result = run_only(ws, backend)
-        execution_time = time.time() - start_time
+# run/score/pipeline 的入口函数延迟导入一次后缓存；三条命令共享
+# 同一段执行+错误处理热路径，命令体只剩薄壳
+_PIPE_FNS: Dict[str, Any] = {}
 
-        data = {"result": result}
-        print(make_cli_success(
-            data, 
-            execution_time=execution_time,
-            workspace=str(ws),
-            backend_used=backend
-        ))
+# mode → (错误 stage, 兜底错误码)
+_MODE_META = {
+    "run": ("execution", "RUN_ERROR"),
+    "score": ("scoring", "SCORE_ERROR"),
+    "pipeline": ("pipeline", "PIPELINE_ERROR"),
+}
 
-    except AutoscorerError as e:
-        print(make_cli_error(e.code, e.message, "execution", {"workspace": workspace}))
-    except Exception as e:
-        print(make_cli_error("RUN_ERROR", str(e), "execution", {"workspace": workspace}))
 
+def _get_pipe_fn(mode: str):
+    fn = _PIPE_FNS.get(mode)
+    if fn is None:
+        from autoscorer import pipeline as _pl
+        _PIPE_FNS.update(run=_pl.run_only, score=_pl.score_only,
+                         pipeline=_pl.run_and_score)
+        fn = _PIPE_FNS[mode]
+    return fn
 
-@app.command()
-def score(workspace: str, 
-          params: Optional[str] = typer.Option(None, help="JSON字符串，评分器参数"), 
-          scorer: Optional[str] = typer.Option(None, help="指定使用的评分器名称")):
-    """对现有预测结果进行评分并生成 result.json"""
+
+def _execute(mode: str, ws: Path, p: Dict, backend: Optional[str],
+             scorer: Optional[str]) -> tuple:
+    """按 mode 调用对应流水线入口，返回 (data, 耗时, 附加字段)。"""
+    fn = _get_pipe_fn(mode)
     start_time = time.time()
-    try:
-        ws = Path(workspace)
-        if not ws.exists():
-            print(make_cli_error("WORKSPACE_NOT_FOUND", f"Workspace not found: {workspace}", "validation", {"workspace": str(ws)}))
-            return
-            
-        # 解析参数
-        try:
-            p: Dict = json.loads(params) if params else {}
-        except json.JSONDecodeError as e:
-            print(make_cli_error("INVALID_PARAMS", f"Invalid JSON params: {str(e)}", "validation", {"params": params}))
-            return
-        
-        from autoscorer.pipeline import score_only
-        result, output_path = score_only(ws, p, scorer_override=scorer)
-        execution_time = time.time() - start_time
-        
-        # 标准化序列化（pydantic v2）
-        payload = result.model_dump() if hasattr(result, 'model_dump') else (result.dict() if hasattr(result, 'dict') else result)
+    if mode == "run":
+        result = fn(ws, backend)
+        data = {"result": result}
+        extras = {"backend_used": backend}
+    elif mode == "score":
+        result, output_path = fn(ws, p, scorer_override=scorer)
+        # 单趟序列化（pydantic v2 走 Rust 序列化器）
         data = {
-            "result": payload,
+            "result": _result_payload(result),
             "output_path": str(output_path)
         }
-        
-        print(make_cli_success(
+        extras = {"scorer_used": scorer or "auto"}
+    else:
+        result = fn(ws, p, backend, scorer_override=scorer)
+        data = {"result": result}
+        extras = {"backend_used": backend, "scorer_used": scorer or "auto"}
+    return data, time.time() - start_time, extras
+
+
+def _run_pipeline_command(mode: str, workspace: str,
+                          backend: Optional[str] = None,
+                          params: Optional[str] = None,
+                          scorer: Optional[str] = None) -> None:
+    stage, err_code = _MODE_META[mode]
+    try:
+        p: Dict = _loads(params) if params else {}
+    except orjson.JSONDecodeError as e:
+        _emit(make_cli_error("INVALID_PARAMS", f"Invalid JSON params: {str(e)}", "validation", {"params": params}))
+        return
+    ws = Path(workspace)
+    try:
+        data, execution_time, extras = _execute(mode, ws, p, backend, scorer)
+        _emit(make_cli_success(
             data,
             execution_time=execution_time,
             workspace=str(ws),
-            scorer_used=scorer or "auto"
+            **extras
         ))
-        
     except AutoscorerError as e:
-        print(make_cli_error(e.code, e.message, "scoring", {"workspace": workspace}))
+        _emit(make_cli_error(e.code, e.message, stage, {"workspace": workspace}))
+    except FileNotFoundError as e:
+        _emit(make_cli_error("WORKSPACE_NOT_FOUND", str(e), stage, {"workspace": workspace}))
     except Exception as e:
-        print(make_cli_error("SCORE_ERROR", str(e), "scoring", {"workspace": workspace}))
+        _emit(make_cli_error(err_code, str(e), stage, {"workspace": workspace}))
+
+
+@app.command()
+def run(workspace: str, backend: str = _BACKEND_OPT):
+    """执行推理容器，生成预测结果（不包含评分）"""
+    _run_pipeline_command("run", workspace, backend=backend)
+
+
+@app.command()
+def score(workspace: str,
+          params: Optional[str] = _PARAMS_OPT,
+          scorer: Optional[str] = _SCORER_OPT):
+    """对现有预测结果进行评分并生成 result.json"""
+    _run_pipeline_command("score", workspace, params=params, scorer=scorer)
 
 
 @app.command()
 def pipeline(workspace: str,
-             backend: str = typer.Option("docker", help="执行后端: docker|k8s|auto"),
-             params: Optional[str] = typer.Option(None, help="JSON字符串，评分器参数"),
-             scorer: Optional[str] = typer.Option(None, help="指定使用的评分器名称")):
+             backend: str = _BACKEND_OPT,
+             params: Optional[str] = _PARAMS_OPT,
+             scorer: Optional[str] = _SCORER_OPT):
     """执行完整的推理+评分流水线"""
-    start_time = time.time()
+    _run_pipeline_command("pipeline", workspace, backend=backend,
+                          params=params, scorer=scorer)
+
+
+
+@functools.lru_cache(maxsize=1)
+def _scorers_list_data(rev: int) -> bytes:
+    """注册表快照预序列化，按 revision 缓存：load/reload/监控重载后
+    revision 递增自动失效，未变更时 list 子命令 O(1) 复用同一份字节。"""
+    from autoscorer.scorers.registry import list_scorers, get_watched_files
+    scorers = list_scorers()
+    data = {
+        "scorers": scorers,
+        "total": len(scorers),
+        "watched_files": get_watched_files()
+    }
+    return orjson.dumps(data, option=_JSON_OPTS)
+
+
+def _scorers_list(file_path: Optional[str], scorer_name: Optional[str], workspace: Optional[str]) -> None:
+    from autoscorer.scorers.registry import registry_revision
     try:
-        ws = Path(workspace)
-        if not ws.exists():
-            print(make_cli_error("WORKSPACE_NOT_FOUND", f"Workspace not found: {workspace}", "validation", {"workspace": str(ws)}))
-            return
-            
-        # 解析参数
-        try:
-            p: Dict = json.loads(params) if params else {}
-        except json.JSONDecodeError as e:
-            print(make_cli_error("INVALID_PARAMS", f"Invalid JSON params: {str(e)}", "validation", {"params": params}))
+        # 预序列化字节以 Fragment 嵌入信封，时间戳仍每次新生成
+        data = orjson.Fragment(_scorers_list_data(registry_revision()))
+        _emit(make_cli_success(data, action="scorers_list"))
+    except Exception as e:
+        _emit(make_cli_error("LIST_ERROR", str(e), "scorers"))
+
+
+def _scorers_load(file_path: Optional[str], scorer_name: Optional[str], workspace: Optional[str]) -> None:
+    from autoscorer.scorers.registry import load_scorer_file, start_watching_file
+    if not file_path:
+        _emit(make_cli_error("MISSING_ARGUMENT", "file_path is required for load action", "scorers"))
+        return
+    try:
+        # 不预先 stat：注册表打开文件时缺失会抛 FileNotFoundError
+        loaded = load_scorer_file(file_path)
+        # 自动启用监控
+        start_watching_file(file_path)
+        data = {
+            "loaded": {name: cls.__name__ for name, cls in loaded.items()},
+            "count": len(loaded),
+            "watching": True,
+            "file_path": file_path
+        }
+        _emit(make_cli_success(data, action="scorers_load"))
+    except FileNotFoundError as e:
+        _emit(make_cli_error("FILE_NOT_FOUND", str(e), "scorers", {"file_path": file_path}))
+    except Exception as e:
+        _emit(make_cli_error("LOAD_ERROR", str(e), "scorers", {"file_path": file_path}))
+
+
+def _scorers_reload(file_path: Optional[str], scorer_name: Optional[str], workspace: Optional[str]) -> None:
+    from autoscorer.scorers.registry import reload_scorer_file
+    if not file_path:
+        _emit(make_cli_error("MISSING_ARGUMENT", "file_path is required for reload action", "scorers"))
+        return
+    try:
+        loaded = reload_scorer_file(file_path)
+        data = {
+            "reloaded": {name: cls.__name__ for name, cls in loaded.items()},
+            "count": len(loaded),
+            "file_path": file_path
+        }
+        _emit(make_cli_success(data, action="scorers_reload"))
+    except FileNotFoundError as e:
+        _emit(make_cli_error("FILE_NOT_FOUND", str(e), "scorers", {"file_path": file_path}))
+    except Exception as e:
+        _emit(make_cli_error("RELOAD_ERROR", str(e), "scorers", {"file_path": file_path}))
+
+
+def _scorers_test(file_path: Optional[str], scorer_name: Optional[str], workspace: Optional[str]) -> None:
+    from autoscorer.scorers.registry import list_scorers, get_scorer_class
+    if not scorer_name or not workspace:
+        _emit(make_cli_error("MISSING_ARGUMENT", "scorer_name and workspace are required for test action", "scorers"))
+        return
+    ws = Path(workspace)
+    if not ws.exists():
+        _emit(make_cli_error("WORKSPACE_NOT_FOUND", f"Workspace not found: {workspace}", "scorers", {"workspace": workspace}))
+        return
+    try:
+        scorer_cls = get_scorer_class(scorer_name)
+        if scorer_cls is None:
+            available = list(list_scorers().keys())
+            _emit(make_cli_error("SCORER_NOT_FOUND", f"Scorer '{scorer_name}' not found", "scorers", {"available": available}))
             return
-        
-        result = pipeline_run_and_score(ws, p, backend, scorer_override=scorer)
-        execution_time = time.time() - start_time
-        
-        data = {"result": result}
-        
-        print(make_cli_success(
-            data,
-            execution_time=execution_time,
-            workspace=str(ws),
-            backend_used=backend,
-            scorer_used=scorer or "auto"
-        ))
-        
-    except AutoscorerError as e:
-        print(make_cli_error(e.code, e.message, "pipeline", {"workspace": workspace}))
+
+        scorer = scorer_cls()
+        result = scorer.score(ws, {})
+        data = {
+            "scorer": scorer_name,
+            "class": scorer_cls.__name__,
+            "result": {
+                "summary": result.summary,
+                "versioning": result.versioning
+            }
+        }
+        _emit(make_cli_success(data, action="scorers_test", workspace=str(ws)))
     except Exception as e:
-        print(make_cli_error("PIPELINE_ERROR", str(e), "pipeline", {"workspace": workspace}))
+        _emit(make_cli_error("TEST_ERROR", str(e), "scorers", {"scorer": scorer_name, "workspace": workspace}))
+
+
+# 子命令分发表：O(1) 查找 + 单一错误出口，取代 if/elif 阶梯
+_SCORER_ACTIONS = {
+    "list": _scorers_list,
+    "load": _scorers_load,
+    "reload": _scorers_reload,
+    "test": _scorers_test,
+}
 
 
 @app.command()
 def scorers(action: str = typer.Argument(help="子命令: list|load|reload|test"), 
-           file_path: Optional[str] = typer.Option(None, help="Python评分器文件路径"),
-           scorer_name: Optional[str] = typer.Option(None, help="评分器名称"),
-           workspace: Optional[str] = typer.Option(None, help="测试工作空间路径")):
+           file_path: Optional[str] = _FILE_PATH_OPT,
+           scorer_name: Optional[str] = _SCORER_NAME_OPT,
+           workspace: Optional[str] = _TEST_WS_OPT):
     """评分器管理：列出、加载、重载和测试评分器"""
-    from autoscorer.scorers.registry import (
-        list_scorers, load_scorer_file, reload_scorer_file, 
-        get_scorer_class, start_watching_file, get_watched_files
-    )
-    
-    if action == "list":
-        try:
-            scorers = list_scorers()
-            watched = get_watched_files()
-            data = {
-                "scorers": scorers,
-                "total": len(scorers),
-                "watched_files": watched
-            }
-            print(make_cli_success(data, action="scorers_list"))
-        except Exception as e:
-            print(make_cli_error("LIST_ERROR", str(e), "scorers"))
-    
-    elif action == "load":
-        if not file_path:
-            print(make_cli_error("MISSING_ARGUMENT", "file_path is required for load action", "scorers"))
-            return
-        if not Path(file_path).exists():
-            print(make_cli_error("FILE_NOT_FOUND", f"File not found: {file_path}", "scorers", {"file_path": file_path}))
-            return
-        try:
-            loaded = load_scorer_file(file_path)
-            # 自动启用监控
-            start_watching_file(file_path)
-            data = {
-                "loaded": {name: cls.__name__ for name, cls in loaded.items()},
-                "count": len(loaded),
-                "watching": True,
-                "file_path": file_path
-            }
-            print(make_cli_success(data, action="scorers_load"))
-        except Exception as e:
-            print(make_cli_error("LOAD_ERROR", str(e), "scorers", {"file_path": file_path}))
-    
-    elif action == "reload":
-        if not file_path:
-            print(make_cli_error("MISSING_ARGUMENT", "file_path is required for reload action", "scorers"))
-            return
-        if not Path(file_path).exists():
-            print(make_cli_error("FILE_NOT_FOUND", f"File not found: {file_path}", "scorers", {"file_path": file_path}))
-            return
-        try:
-            loaded = reload_scorer_file(file_path)
-            data = {
-                "reloaded": {name: cls.__name__ for name, cls in loaded.items()},
-                "count": len(loaded),
-                "file_path": file_path
-            }
-            print(make_cli_success(data, action="scorers_reload"))
-        except Exception as e:
-            print(make_cli_error("RELOAD_ERROR", str(e), "scorers", {"file_path": file_path}))
-    
-    elif action == "test":
-        if not scorer_name or not workspace:
-            print(make_cli_error("MISSING_ARGUMENT", "scorer_name and workspace are required for test action", "scorers"))
-            return
-        if not Path(workspace).exists():
-            print(make_cli_error("WORKSPACE_NOT_FOUND", f"Workspace not found: {workspace}", "scorers", {"workspace": workspace}))
-            return
-        try:
-            scorer_cls = get_scorer_class(scorer_name)
-            if scorer_cls is None:
-                available = list(list_scorers().keys())
-                print(make_cli_error("SCORER_NOT_FOUND", f"Scorer '{scorer_name}' not found", "scorers", {"available": available}))
-                return
-            
-            ws = Path(workspace)
-            scorer = scorer_cls()
-            result = scorer.score(ws, {})
-            data = {
-                "scorer": scorer_name,
-                "class": scorer_cls.__name__,
-                "result": {
-                    "summary": result.summary,
-                    "versioning": result.versioning
-                }
-            }
-            print(make_cli_success(data, action="scorers_test", workspace=str(ws)))
-        except Exception as e:
-            print(make_cli_error("TEST_ERROR", str(e), "scorers", {"scorer": scorer_name, "workspace": workspace}))
-    
+    handler = _SCORER_ACTIONS.get(action)
+    if handler is None:
+        _emit(make_cli_error("INVALID_ACTION", f"Unknown action: {action}. Use: list|load|reload|test", "scorers"))
+        return
+    handler(file_path, scorer_name, workspace)
+
+
+_CONFIG_SHOW_KEYS = [
+    "DOCKER_HOST", "IMAGE_PULL_POLICY", "DEFAULT_CPU", "DEFAULT_MEMORY",
+    "DEFAULT_GPU", "TIMEOUT", "K8S_ENABLED", "K8S_NAMESPACE",
+    "CELERY_BROKER", "LOG_DIR", "WORKSPACE_ROOT"
+]
+
+
+def _config_paths(config_path: Optional[str]) -> None:
+    # 显示配置文件搜索路径
+    from autoscorer.utils.config import get_config_search_paths, find_config_file
+    paths_info = {
+        "search_paths": get_config_search_paths(),
+        "current_config": find_config_file(),
+        "search_order": [
+            "1. 当前工作目录",
+            "2. 项目根目录", 
+            "3. 用户主目录 (~/.autoscorer/)",
+            "4. 系统配置目录 (/etc/autoscorer/)"
+        ]
+    }
+    _emit(make_cli_success(paths_info))
+
+
+def _config_show(config_path: Optional[str]) -> None:
+    # 显示主要配置项
+    from autoscorer.utils.config import Config
+    cfg = Config(config_path) if config_path else Config()
+    config_data = {key: cfg.get(key) for key in _CONFIG_SHOW_KEYS}
+    _emit(make_cli_success(config_data, config_file=cfg.get_config_path()))
+
+
+def _config_validate(config_path: Optional[str]) -> None:
+    # 验证配置
+    from autoscorer.utils.config import Config
+    cfg = Config(config_path) if config_path else Config()
+    errors = cfg.validate()
+    if errors:
+        _emit(make_cli_error("CONFIG_VALIDATION_ERROR", 
+                           f"Found {len(errors)} configuration errors", 
+                           "config_management",
+                           {"errors": errors}))
     else:
-        print(make_cli_error("INVALID_ACTION", f"Unknown action: {action}. Use: list|load|reload|test", "scorers"))
+        _emit(make_cli_success({"validation": "passed"}, config_file=cfg.get_config_path()))
+
+
+def _config_dump(config_path: Optional[str]) -> None:
+    # 导出配置（隐藏敏感信息）
+    from autoscorer.utils.config import Config
+    cfg = Config(config_path) if config_path else Config()
+    _emit(make_cli_success(cfg.dump(), config_file=cfg.get_config_path()))
+
+
+_CONFIG_ACTIONS = {
+    "paths": _config_paths,
+    "show": _config_show,
+    "validate": _config_validate,
+    "dump": _config_dump,
+}
 
 
 @app.command()
 def config(action: str = typer.Argument(help="子命令: show|validate|dump|paths"), 
-          config_path: Optional[str] = typer.Option(None, help="自定义配置文件路径")):
+          config_path: Optional[str] = _CONFIG_PATH_OPT):
     """配置管理：显示、验证和导出配置"""
+    handler = _CONFIG_ACTIONS.get(action)
+    if handler is None:
+        _emit(make_cli_error("INVALID_ACTION", f"Unknown action: {action}. Use: show|validate|dump|paths", "config_management"))
+        return
     try:
-        from autoscorer.utils.config import Config, get_config_search_paths, find_config_file
-        
-        if action == "paths":
-            # 显示配置文件搜索路径
-            search_paths = get_config_search_paths()
-            current_config = find_config_file()
-            
-            paths_info = {
-                "search_paths": search_paths,
-                "current_config": current_config,
-                "search_order": [
-                    "1. 当前工作目录",
-                    "2. 项目根目录", 
-                    "3. 用户主目录 (~/.autoscorer/)",
-                    "4. 系统配置目录 (/etc/autoscorer/)"
-                ]
-            }
-            print(make_cli_success(paths_info))
-            return
-        
-        cfg = Config(config_path) if config_path else Config()
-        
-        if action == "show":
-            # 显示主要配置项
-            key_configs = [
-                "DOCKER_HOST", "IMAGE_PULL_POLICY", "DEFAULT_CPU", "DEFAULT_MEMORY", 
-                "DEFAULT_GPU", "TIMEOUT", "K8S_ENABLED", "K8S_NAMESPACE",
-                "CELERY_BROKER", "LOG_DIR", "WORKSPACE_ROOT"
-            ]
-            
-            config_data = {}
-            for key in key_configs:
-                config_data[key] = cfg.get(key)
-            
-            print(make_cli_success(config_data, config_file=cfg.get_config_path()))
-            
-        elif action == "validate":
-            # 验证配置
-            errors = cfg.validate()
-            if errors:
-                print(make_cli_error("CONFIG_VALIDATION_ERROR", 
-                                   f"Found {len(errors)} configuration errors", 
-                                   "config_management",
-                                   {"errors": errors}))
-            else:
-                print(make_cli_success({"validation": "passed"}, config_file=cfg.get_config_path()))
-                
-        elif action == "dump":
-            # 导出配置（隐藏敏感信息）
-            config_dump = cfg.dump()
-            print(make_cli_success(config_dump, config_file=cfg.get_config_path()))
-            
-        else:
-            print(make_cli_error("INVALID_ACTION", f"Unknown action: {action}. Use: show|validate|dump|paths", "config_management"))
-            
+        handler(config_path)
     except Exception as e:
-        print(make_cli_error("CONFIG_ERROR", str(e), "config_management", {"config_path": config_path}))
+        _emit(make_cli_error("CONFIG_ERROR", str(e), "config_management", {"config_path": config_path}))
 
 
 if __name__ == "__main__":
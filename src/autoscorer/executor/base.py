@@ -1,11 +1,44 @@
 from __future__ import annotations
+import functools
 from pathlib import Path
-from abc import ABC, abstractmethod
+from typing import Optional, Protocol, Tuple, runtime_checkable
 from ..schemas.job import JobSpec
 
+try:
+    from docker.utils import parse_repository_tag as _docker_parse  # type: ignore
+except ImportError:  # docker SDK 未安装时走纯字符串回退
+    _docker_parse = None
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_repo_tag(ref: str) -> Tuple[str, Optional[str]]:
+    """拆分镜像引用为 (repo, tag)；解析纯函数，结果按引用字符串缓存。
+
+    两个执行器共用：resolve/pull/create 对同一引用只解析一次，也不再
+    在每次调用时重新 import docker.utils。
+    """
+    if _docker_parse is not None:
+        try:
+            return _docker_parse(ref)
+        except Exception:
+            pass
+    # 回退：基于最后一个'/'之后的冒号切分，避免误伤 registry:port
+    slash = ref.rfind('/')
+    colon = ref.rfind(':')
+    if colon > slash:
+        return ref[:colon], ref[colon + 1:]
+    return ref, None
+
+
+@runtime_checkable
+class Executor(Protocol):
+    """执行器结构化协议（PEP 544）。
+
+    用 Protocol 取代 ABC：省掉 ABCMeta 在每个子类创建与 isinstance
+    检查时的注册/钩子开销。实现类可显式继承（保留 IDE 提示），也可
+    只按签名鸭子类型实现。
+    """
 
-class Executor(ABC):
-    @abstractmethod
     def run(self, spec: JobSpec, workspace: Path) -> None:
         """执行选手容器完成推理阶段。"""
-        raise NotImplementedError
+        ...
@@ -1,34 +1,275 @@
 from __future__ import annotations
 from pathlib import Path
+import atexit
 import os
-from .base import Executor
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .base import Executor, parse_repo_tag
 from ..schemas.job import JobSpec
 from autoscorer.utils.config import Config
 import docker
 from docker.types import DeviceRequest
 import json
 from autoscorer.utils.errors import AutoscorerError
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 from autoscorer.utils.logger import get_logger
 
 logger = get_logger("executor.docker")
 
+# 按 (base_url, api_version, tls) 复用长连接客户端：每次构造
+# DockerClient 都要付 socket 建连 + /version 协商的开销，CLI 路径
+# 常常每个任务新建一个执行器，短任务下这部分占比可观
+_CLIENT_CACHE: Dict[tuple, docker.DockerClient] = {}
+_CLIENT_LOCK = threading.Lock()
+
+
+def _close_cached_clients() -> None:
+    for c in _CLIENT_CACHE.values():
+        try:
+            c.close()
+        except Exception:
+            pass
+
+
+atexit.register(_close_cached_clients)
+
+
+def _get_client(base_url: str, api_version: Optional[str],
+                tls_params: Optional[tuple],
+                pool_maxsize: int = 32) -> docker.DockerClient:
+    key = (base_url, api_version, tls_params, pool_maxsize)
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        with _CLIENT_LOCK:
+            client = _CLIENT_CACHE.get(key)
+            if client is None:
+                # TLSConfig 只在显式开启校验时构造：unix socket 上 TLS
+                # 无意义，省掉适配器里的相应分支
+                tls = False
+                if tls_params is not None:
+                    ca_cert, client_cert, client_key = tls_params
+                    tls = docker.tls.TLSConfig(
+                        verify=True,
+                        ca_cert=ca_cert,
+                        client_cert=((client_cert, client_key)
+                                     if client_cert and client_key else None))
+                # max_pool_size 贯穿 docker-py 所有传输层（含 unix socket
+                # 适配器）；默认 10，在 pull/wait/logs/remove 并发打同一
+                # daemon 时会在连接池上排队
+                client = docker.DockerClient(
+                    base_url=base_url, version=api_version, tls=tls,
+                    max_pool_size=pool_maxsize)
+                _CLIENT_CACHE[key] = client
+    return client
+
+
+def _write_bytes(path, data: bytes) -> None:
+    """单个 fd 上一次 os.write 落盘：省掉 Path.write_text 的
+    open/编码/TextIOWrapper 包装，每个任务少几次系统调用。"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+# 镜像拉取在后台线程进行，与工作区准备重叠。一个 run 最多一个 pull，
+# 但 API 允许 MAX_CONCURRENT_RUNS 个 run 并发，线程数与之对齐，避免
+# 并发任务的 pull 在单线程后面排队
+try:
+    _PULL_WORKERS = max(1, int(Config().get("MAX_CONCURRENT_RUNS", 4)))
+except Exception:
+    _PULL_WORKERS = 4
+_PULL_POOL = ThreadPoolExecutor(max_workers=_PULL_WORKERS, thread_name_prefix="docker-pull")
+
+# (pull_policy, 本地是否已有镜像) → 是否拉取
+_PULL_DECISION = {
+    ("always", True): True,
+    ("always", False): True,
+    ("ifnotpresent", True): False,
+    ("ifnotpresent", False): True,
+    ("never", True): False,
+    ("never", False): False,
+}
+
+
 class DockerExecutor(Executor):
     """支持远程API、配置化资源参数的docker执行器。"""
 
+    # 已确认本机 ~/.docker/config.json 带有凭据的 registry，pull 时
+    # 无需再附带 auth_config（进程内缓存，省掉重复读配置文件）
+    _known_auth_registries: set = set()
+
     def __init__(self, config_path: str = "config.yaml", node_host: str | None = None):
         self.cfg = Config(config_path)
         # 优先使用传入的 node_host，其次使用配置/环境中的 DOCKER_HOST，最后默认本机 docker.sock
         base_url = node_host or self.cfg.get("DOCKER_HOST") or "unix:///var/run/docker.sock"
+        # 指向本机回环的 TCP 端点改走 unix socket：省掉回环 TCP/IP 栈的
+        # 建连与逐包开销（每个 API 调用都要付）；socket 不存在则保持 TCP
+        if (self.cfg.get("PREFER_UNIX_SOCK", True)
+                and isinstance(base_url, str)
+                and base_url.startswith(("tcp://127.", "tcp://localhost"))
+                and os.path.exists("/var/run/docker.sock")):
+            logger.info(f"Local TCP endpoint {base_url} replaced with unix:///var/run/docker.sock")
+            base_url = "unix:///var/run/docker.sock"
         self.base_url = base_url
-        self.client = docker.DockerClient(
-            base_url=base_url,
-            version=self.cfg.get("DOCKER_API_VERSION"),
-            tls=self.cfg.get("DOCKER_TLS_VERIFY", False)
+        # TLS 仅对远端 tcp/https 端点且显式开启校验时生效
+        tls_params = None
+        if (self.cfg.get("DOCKER_TLS_VERIFY", False)
+                and isinstance(base_url, str)
+                and base_url.startswith(("tcp://", "https://"))):
+            tls_params = (
+                self.cfg.get("DOCKER_TLS_CA"),
+                self.cfg.get("DOCKER_TLS_CERT"),
+                self.cfg.get("DOCKER_TLS_KEY"),
+            )
+        self.client = _get_client(
+            base_url,
+            self.cfg.get("DOCKER_API_VERSION"),
+            tls_params,
+            pool_maxsize=int(self.cfg.get("DOCKER_POOL_MAXSIZE", 32))
         )
 
+    def _registry_auth_config(self) -> Optional[dict]:
+        """返回 pull 需要附带的凭据；本机 docker 配置已缓存凭据或未
+        配置 registry 时返回 None（docker-py 会自行回退到 config.json）。"""
+        reg_user = self.cfg.get("REGISTRY_USER")
+        reg_pass = self.cfg.get("REGISTRY_PASS")
+        reg_url = self.cfg.get("REGISTRY_URL")
+        if not (reg_user and reg_pass and reg_url):
+            return None
+        if reg_url in DockerExecutor._known_auth_registries:
+            return None
+        try:
+            auths = json.loads(
+                (Path.home() / ".docker" / "config.json").read_text()
+            ).get("auths", {})
+            if reg_url in auths:
+                DockerExecutor._known_auth_registries.add(reg_url)
+                return None
+        except Exception:
+            pass
+        return {"username": reg_user, "password": reg_pass}
+
+    def _pull_with_retry(self, normalized_ref: str, auth_config: Optional[dict],
+                         max_retries: int) -> None:
+        """带抖动指数退避的镜像拉取（在后台线程执行）。
+
+        走低层 APIClient.pull 流式接口：高层 images.pull 在拉取完成后
+        还会再查一次镜像列表来构造 Image 对象，这里不需要返回值，省掉
+        那趟 /images 往返。
+        """
+        repo, tag = parse_repo_tag(normalized_ref)
+        last_err: Exception = RuntimeError("no pull attempt made")
+        for attempt in range(max_retries):
+            try:
+                logger.info(f"Pulling image {normalized_ref} (attempt {attempt + 1}/{max_retries})")
+                for line in self.client.api.pull(repo, tag=tag or "latest",
+                                                 stream=True, decode=True,
+                                                 auth_config=auth_config):
+                    # daemon 把拉取失败以 error 事件写进流里，HTTP 层面仍是 200
+                    if isinstance(line, dict) and line.get("error"):
+                        raise RuntimeError(line["error"])
+                return
+            except Exception as e:
+                last_err = e
+                logger.warning(f"Pull attempt {attempt + 1} failed: {e}")
+                if attempt < max_retries - 1:
+                    # 随机抖动避免多任务同时重试打爆 registry
+                    time.sleep(random.uniform(0.5, 1.5) * (2 ** attempt))
+        raise last_err
+
     def run(self, spec: JobSpec, workspace: Path) -> None:
         ws = workspace.resolve()
+
+        # ---- 镜像解析与拉取决策先行：拉取交给后台线程，与下面的
+        # 工作区准备（路径映射、mkdir、参数归一）重叠进行 ----
+        pull_policy = str(self.cfg.get("IMAGE_PULL_POLICY", "ifnotpresent")).lower()
+        image_present = False
+        image_id = None
+        action = "unknown"
+        requested_ref = spec.container.image
+
+        # 规范化镜像引用（补全 tag，解析走 base.parse_repo_tag 共享缓存）
+        repo, tag = parse_repo_tag(requested_ref)
+        normalized_ref = f"{repo}:{tag or 'latest'}"
+        
+        def _resolve_local_image() -> tuple[bool, Optional[str]]:
+            # images.get 一次 GET 即可判定（支持 id/name:tag）；未命中是
+            # 明确的 ImageNotFound，不必再走逐仓库 list+扫描
+            try:
+                img0 = self.client.images.get(normalized_ref)
+                return True, getattr(img0, 'id', None)
+            except docker.errors.ImageNotFound:
+                return False, None
+            except Exception:
+                # get 本身异常（如 daemon 瞬时错误）时才退回一次精确过滤
+                try:
+                    lst = self.client.images.list(filters={"reference": normalized_ref})
+                    if lst:
+                        return True, getattr(lst[0], 'id', None)
+                except Exception:
+                    pass
+                return False, None
+
+        image_present, image_id = _resolve_local_image()
+        if image_present:
+            action = "use_local"
+            logger.info(f"Found local image: {normalized_ref} -> {image_id}")
+        else:
+            logger.info(f"Image not found locally: {normalized_ref}")
+
+        def _try_load_local_image() -> bool:
+            nonlocal image_id, image_present
+            # 支持在工作目录放置 image.tar(.gz/.tgz) 离线导入
+            for name in ("image.tar", "image.tar.gz", "image.tgz"):
+                p = ws / name
+                if p.exists():
+                    try:
+                        logger.info(f"Loading local image from {name}")
+                        # 传文件对象让 HTTP body 流式上传：RSS 只与
+                        # socket 缓冲相关，不随镜像体积增长；gz 归档走
+                        # gzip.open 使解压同样流式进行
+                        import gzip
+                        opener = (gzip.open if name.endswith((".gz", ".tgz"))
+                                  else Path.open)
+                        with opener(p, "rb") as fh:
+                            self.client.images.load(fh)
+                        try:
+                            img2 = self.client.images.get(normalized_ref)
+                            image_id = getattr(img2, 'id', None)
+                            image_present = True
+                        except Exception:
+                            image_present = True  # 已加载但未能解析ID
+                        return True
+                    except Exception as e:
+                        logger.warning(f"Failed to load {name}: {e}")
+            return False
+
+        # 镜像拉取逻辑，增加重试机制
+        max_retries = 3
+
+        # 决定是否需要拉取镜像：查表代替 if/elif 阶梯，未知策略立即报错
+        try:
+            should_pull = _PULL_DECISION[(pull_policy, image_present)]
+        except KeyError:
+            raise AutoscorerError(
+                code="INVALID_PULL_POLICY",
+                message=f"unknown IMAGE_PULL_POLICY '{pull_policy}'; use always|ifnotpresent|never",
+                details={"policy": pull_policy}
+            )
+        logger.info(f"Image pull strategy: policy={pull_policy}, present={image_present}, will_pull={should_pull}")
+        pull_future = None
+        if should_pull:
+            # 凭据只在真正 pull 时附带（无状态 auth_config，不再每次
+            # run 都 login 打一趟 registry 的 /v2/ 探活）
+            auth_config = self._registry_auth_config()
+            pull_future = _PULL_POOL.submit(
+                self._pull_with_retry, normalized_ref, auth_config, max_retries)
+
+        # ---- 工作区准备（与后台镜像拉取并行）----
         # 当通过 docker.sock 连接宿主 Docker 时，卷的 source 必须是“宿主机可见”的真实路径。
         # 这里将容器内路径（如 /app 或 /data/examples）映射回宿主机绝对路径。
         ws_str = str(ws)
@@ -55,8 +296,16 @@ class DockerExecutor(Executor):
         input_dir = (ws_host / "input").resolve()
         output_dir = (ws_host / "output").resolve()
         logs_dir = (ws_host / "logs").resolve()
-        logs_dir.mkdir(parents=True, exist_ok=True)
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # 目录已存在是常态：单次 os.mkdir 尝试（一个系统调用）即可，
+        # 父目录缺失时才回退逐级 makedirs；比 Path.mkdir(parents=True)
+        # 每次都先逐级 stat 便宜
+        for d in (logs_dir, output_dir):
+            try:
+                os.mkdir(d)
+            except FileExistsError:
+                pass
+            except FileNotFoundError:
+                os.makedirs(d, exist_ok=True)
 
         # 资源参数
         def _norm_mem(v: str | int | float | None, default: str = "4g") -> str:
@@ -80,12 +329,13 @@ class DockerExecutor(Executor):
         # 环境变量
         env = spec.container.env or {}
 
-        # 挂载
-        mounts = [
-            {"source": str(input_dir), "target": "/workspace/input", "type": "bind", "read_only": True},
-            {"source": str(output_dir), "target": "/workspace/output", "type": "bind", "read_only": False},
-            {"source": str((ws_host / "meta.json").resolve()), "target": "/workspace/meta.json", "type": "bind", "read_only": True},
-        ]
+        # 挂载（直接构造 containers.run 需要的 volumes 形参，不再经过
+        # 中间 mounts 列表 + 字典推导的二次转换）
+        volumes = {
+            str(input_dir): {"bind": "/workspace/input", "mode": "ro"},
+            str(output_dir): {"bind": "/workspace/output", "mode": "rw"},
+            str((ws_host / "meta.json").resolve()): {"bind": "/workspace/meta.json", "mode": "ro"},
+        }
 
         # 安全选项
         security_opts = self.cfg.get("SECURITY_OPTS", ["no-new-privileges:true"])
@@ -102,159 +352,6 @@ class DockerExecutor(Executor):
             # 允许用户直接提供自定义 docker 网络名
             network_mode = policy
 
-        # 镜像仓库登录（可选）
-        reg_user = self.cfg.get("REGISTRY_USER")
-        reg_pass = self.cfg.get("REGISTRY_PASS")
-        reg_url = self.cfg.get("REGISTRY_URL")
-        try:
-            if reg_user and reg_pass and reg_url:
-                self.client.login(username=reg_user, password=reg_pass, registry=reg_url)
-        except Exception:
-            pass
-
-        # 镜像解析与拉取策略
-        pull_policy = str(self.cfg.get("IMAGE_PULL_POLICY", "ifnotpresent")).lower()
-        image_present = False
-        image_id = None
-        action = "unknown"
-        requested_ref = spec.container.image
-
-        # 规范化镜像引用（补全 tag，优先使用 docker 的解析）
-        def _parse_repo_tag(ref: str) -> Tuple[str, Optional[str]]:
-            try:
-                from docker.utils import utils as docker_utils  # type: ignore
-                repo, tag = docker_utils.parse_repository_tag(ref)
-                return repo, tag
-            except Exception:
-                # 回退：基于最后一个'/'之后的冒号切分，避免误伤 registry:port
-                slash = ref.rfind('/')
-                colon = ref.rfind(':')
-                if colon > slash:
-                    return ref[:colon], ref[colon + 1:]
-                return ref, None
-
-        repo, tag = _parse_repo_tag(requested_ref)
-        normalized_ref = f"{repo}:{tag or 'latest'}"
-        
-        def _resolve_local_image() -> tuple[bool, Optional[str]]:
-            # 优先直接 get（支持 id/name:tag）
-            try:
-                img0 = self.client.images.get(normalized_ref)
-                return True, getattr(img0, 'id', None)
-            except Exception:
-                pass
-            # 尝试 filters.reference 精确匹配
-            try:
-                lst = self.client.images.list(filters={"reference": normalized_ref})
-                if lst:
-                    return True, getattr(lst[0], 'id', None)
-            except Exception:
-                pass
-            # 尝试按仓库名列出并比对 tags
-            try:
-                lst2 = self.client.images.list(name=repo)
-                for im in lst2 or []:
-                    for t in getattr(im, 'tags', []) or []:
-                        if t == normalized_ref:
-                            return True, getattr(im, 'id', None)
-            except Exception:
-                pass
-            return False, None
-
-        image_present, image_id = _resolve_local_image()
-        if image_present:
-            action = "use_local"
-            logger.info(f"Found local image: {normalized_ref} -> {image_id}")
-        else:
-            logger.info(f"Image not found locally: {normalized_ref}")
-
-        def _try_load_local_image() -> bool:
-            nonlocal image_id, image_present
-            # 支持在工作目录放置 image.tar(.gz/.tgz) 离线导入
-            for name in ("image.tar", "image.tar.gz", "image.tgz"):
-                p = ws / name
-                if p.exists():
-                    try:
-                        logger.info(f"Loading local image from {name}")
-                        data = p.read_bytes()
-                        self.client.images.load(data)
-                        try:
-                            img2 = self.client.images.get(normalized_ref)
-                            image_id = getattr(img2, 'id', None)
-                            image_present = True
-                        except Exception:
-                            image_present = True  # 已加载但未能解析ID
-                        return True
-                    except Exception as e:
-                        logger.warning(f"Failed to load {name}: {e}")
-            return False
-
-        # 镜像拉取逻辑，增加重试机制
-        max_retries = 3
-        
-        # 决定是否需要拉取镜像
-        should_pull = False
-        if pull_policy == "always":
-            should_pull = True
-            logger.info("Image pull strategy: policy=always, will pull")
-        elif pull_policy == "ifnotpresent" and not image_present:
-            should_pull = True
-            logger.info("Image pull strategy: policy=ifnotpresent, present=false, will pull")
-        elif pull_policy == "ifnotpresent" and image_present:
-            should_pull = False
-            logger.info("Image pull strategy: policy=ifnotpresent, present=true, using local image")
-        elif pull_policy == "never":
-            should_pull = False
-            logger.info("Image pull strategy: policy=never, will not pull")
-        
-        if should_pull:
-            pull_success = False
-            for attempt in range(max_retries):
-                try:
-                    logger.info(f"Pulling image {normalized_ref} (attempt {attempt + 1}/{max_retries})")
-                    self.client.images.pull(normalized_ref)
-                    try:
-                        img = self.client.images.get(normalized_ref)
-                        image_id = getattr(img, 'id', None)
-                        image_present = True
-                    except Exception:
-                        pass
-                    action = "pulled"
-                    pull_success = True
-                    logger.info(f"Successfully pulled image: {normalized_ref}")
-                    break
-                except Exception as e:
-                    logger.warning(f"Pull attempt {attempt + 1} failed: {e}")
-                    if attempt == max_retries - 1:
-                        # 最后一次拉取失败，尝试本地离线镜像
-                        if _try_load_local_image():
-                            action = "loaded_tar"
-                            pull_success = True
-                            logger.info("Loaded image from local tar file")
-                        else:
-                            # 如果之前检测到本地有镜像，使用本地镜像并警告
-                            if image_present:
-                                logger.warning("Failed to pull new image, using existing local image")
-                                action = "use_local_fallback"
-                                pull_success = True
-                            else:
-                                raise AutoscorerError(
-                                    code="IMAGE_PULL_FAILED",
-                                    message=f"failed to pull image {normalized_ref} after {max_retries} attempts: {e}",
-                                    details={"policy": pull_policy, "attempts": max_retries, "last_error": str(e)}
-                                )
-                    else:
-                        # 等待后重试
-                        import time
-                        time.sleep(2 ** attempt)  # 指数退避
-            
-            if not pull_success:
-                raise AutoscorerError(
-                    code="IMAGE_PULL_FAILED",
-                    message=f"failed to pull image {normalized_ref}",
-                    details={"policy": pull_policy}
-                )
-                
         if pull_policy == "never" and not image_present:
             # 不允许拉取且本地不存在时，尝试离线导入
             if _try_load_local_image():
@@ -267,6 +364,32 @@ class DockerExecutor(Executor):
                         f"please pre-pull it or place an image.tar in {ws}"
                     ),
                 )
+        # 收取后台拉取结果（失败回退顺序与原来一致：
+        # 离线 tar → 本地旧镜像 → IMAGE_PULL_FAILED）
+        if pull_future is not None:
+            try:
+                pull_future.result()
+                try:
+                    img = self.client.images.get(normalized_ref)
+                    image_id = getattr(img, 'id', None)
+                    image_present = True
+                except Exception:
+                    pass
+                action = "pulled"
+                logger.info(f"Successfully pulled image: {normalized_ref}")
+            except Exception as e:
+                if _try_load_local_image():
+                    action = "loaded_tar"
+                    logger.info("Loaded image from local tar file")
+                elif image_present:
+                    logger.warning("Failed to pull new image, using existing local image")
+                    action = "use_local_fallback"
+                else:
+                    raise AutoscorerError(
+                        code="IMAGE_PULL_FAILED",
+                        message=f"failed to pull image {normalized_ref} after {max_retries} attempts: {e}",
+                        details={"policy": pull_policy, "attempts": max_retries, "last_error": str(e)}
+                    )
 
         # 记录镜像解析信息
         try:
@@ -279,7 +402,11 @@ class DockerExecutor(Executor):
                 "action": action,
                 "docker_host": self.base_url,
             }
-            (logs_dir / "run_info.json").write_text(json.dumps(info_payload, ensure_ascii=False, indent=2))
+            # 紧凑 JSON（DEBUG 时才缩进），单次 os.write 写入
+            _write_bytes(
+                logs_dir / "run_info.json",
+                json.dumps(info_payload, ensure_ascii=False,
+                           indent=2 if self.cfg.get("DEBUG") else None).encode())
             logger.info(f"docker image: {normalized_ref} -> {image_id or 'unknown'} ({action})")
         except Exception:
             pass
@@ -295,7 +422,7 @@ class DockerExecutor(Executor):
                 image=normalized_ref,
                 command=spec.container.cmd or [],
                 environment=env,
-                volumes={m["source"]: {"bind": m["target"], "mode": "ro" if m["read_only"] else "rw"} for m in mounts},
+                volumes=volumes,
                 network_mode=network_mode,
                 security_opt=security_opts,
                 shm_size=shm_size,
@@ -320,16 +447,31 @@ class DockerExecutor(Executor):
                 else:
                     raise AutoscorerError(code="CONTAINER_WAIT_FAILED", message=str(e))
     
-            logs = container.logs(stdout=True, stderr=True).decode(errors="ignore")
-            (logs_dir / "container.log").write_text(logs)
+            # 日志分块流式落盘：不把全量 stdout+stderr 先攒成 bytes 再
+            # decode 成 str，内存占用只有单个分块大小，网络读与磁盘写重叠；
+            # 分块直接 os.write 到 fd，不经过缓冲文件对象
+            log_fd = os.open(logs_dir / "container.log",
+                             os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                for chunk in container.logs(stdout=True, stderr=True,
+                                            stream=True, follow=False):
+                    os.write(log_fd, chunk)
+            finally:
+                os.close(log_fd)
             if isinstance(result, dict):
                 status = result.get("StatusCode", result.get("Status", 1))
             else:
                 status = result
 
             if status != 0:
-                info = container.attrs
-                (logs_dir / "inspect.json").write_text(str(info))
+                # 只在失败时显式 inspect 一次（成功路径零额外往返），
+                # 并写成可被看板直接解析的 JSON 而不是 str(dict)
+                try:
+                    info = self.client.api.inspect_container(container.id)
+                    _write_bytes(logs_dir / "inspect.json",
+                                 json.dumps(info, ensure_ascii=False).encode())
+                except Exception:
+                    pass
                 raise AutoscorerError(code="CONTAINER_EXIT_NONZERO", message=f"exit {status}")
         finally:
             try:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from pathlib import Path
-from .base import Executor
+import weakref
+from .base import Executor, parse_repo_tag
 from ..schemas.job import JobSpec
 from autoscorer.utils.config import Config
 from autoscorer.utils.errors import AutoscorerError
@@ -8,10 +9,31 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# kubernetes 客户端（约 20MB 生成代码）在模块导入时解析一次；本模块
+# 只在选择 k8s 后端时被 scheduler 惰性导入，Docker 路径不付这个成本，
+# 每个任务也不再重复走 import 机制
+try:
+    import kubernetes
+    from kubernetes.client.rest import ApiException
+    _KUBE_ERR = None
+except ImportError as e:
+    kubernetes = None
+    ApiException = Exception  # 占位，保证 except 子句语法可用
+    _KUBE_ERR = e
+
+
+def _get_kubernetes():
+    if kubernetes is None:
+        raise AutoscorerError(
+            code="K8S_CLIENT_ERROR",
+            message="kubernetes client not installed. Run: pip install kubernetes"
+        )
+    return kubernetes
+
 
 class K8sExecutor(Executor):
     """Kubernetes执行器 - 改进实现"""
-    
+
     def __init__(self, config_path: str = "config.yaml"):
         self.cfg = Config(config_path)
         self.namespace = self.cfg.get("K8S_NAMESPACE", "autoscore")
@@ -24,10 +46,35 @@ class K8sExecutor(Executor):
                 code="K8S_CONFIG_ERROR",
                 message="K8S_API not configured"
             )
-    
+
+        # 配置与 BatchV1Api 在构造期建好并缓存：run 不再每个任务
+        # 重建 Configuration / 重新认证 / 新开连接池
+        kubernetes = _get_kubernetes()
+        if self.token:
+            # 使用Token认证
+            configuration = kubernetes.client.Configuration()
+            configuration.host = self.api_server
+            configuration.api_key["authorization"] = self.token
+            configuration.api_key_prefix['authorization'] = 'Bearer'
+            if self.ca_cert:
+                configuration.ssl_ca_cert = self.ca_cert
+            else:
+                configuration.verify_ssl = False
+            kubernetes.client.Configuration.set_default(configuration)
+        else:
+            # 使用集群内配置或kubeconfig
+            try:
+                kubernetes.config.load_incluster_config()
+            except:
+                kubernetes.config.load_kube_config()
+        self._batch_v1 = kubernetes.client.BatchV1Api()
+        # 执行器被回收时关闭底层连接池（回调只引用 api_client，不延长
+        # self 的生命周期）
+        weakref.finalize(self, self._batch_v1.api_client.close)
+
     def run(self, spec: JobSpec, workspace: Path) -> None:
         """使用Kubernetes Job执行容器任务
-        
+
         注意：这是一个基础实现，生产环境需要完善以下功能：
         - PV/PVC挂载workspace
         - 实时日志收集
@@ -35,53 +82,23 @@ class K8sExecutor(Executor):
         - 资源配额验证
         - 安全策略配置
         """
-        try:
-            # 尝试导入kubernetes客户端
-            import kubernetes
-            from kubernetes.client.rest import ApiException
-        except ImportError:
-            raise AutoscorerError(
-                code="K8S_CLIENT_ERROR",
-                message="kubernetes client not installed. Run: pip install kubernetes"
-            )
-        
         logger.info(f"Creating K8s Job for {spec.job_id}")
-        
+
         try:
-            # 配置K8s客户端
-            if self.token:
-                # 使用Token认证
-                configuration = kubernetes.client.Configuration()
-                configuration.host = self.api_server
-                configuration.api_key["authorization"] = self.token
-                configuration.api_key_prefix['authorization'] = 'Bearer'
-                if self.ca_cert:
-                    configuration.ssl_ca_cert = self.ca_cert
-                else:
-                    configuration.verify_ssl = False
-                kubernetes.client.Configuration.set_default(configuration)
-            else:
-                # 使用集群内配置或kubeconfig
-                try:
-                    kubernetes.config.load_incluster_config()
-                except:
-                    kubernetes.config.load_kube_config()
-            
             # 创建Job规范
             job_manifest = self._create_job_manifest(spec, workspace)
-            
-            # 提交Job
-            batch_v1 = kubernetes.client.BatchV1Api()
-            job = batch_v1.create_namespaced_job(
+
+            # 提交Job（复用构造期缓存的 API 句柄）
+            job = self._batch_v1.create_namespaced_job(
                 namespace=self.namespace,
                 body=job_manifest
             )
-            
+
             logger.info(f"Created K8s Job: {job.metadata.name}")
-            
+
             # 等待Job完成 (简化实现)
-            self._wait_for_job_completion(batch_v1, job.metadata.name)
-            
+            self._wait_for_job_completion(self._batch_v1, job.metadata.name)
+
         except ApiException as e:
             raise AutoscorerError(
                 code="K8S_API_ERROR",
@@ -96,21 +113,10 @@ class K8sExecutor(Executor):
     
     def _create_job_manifest(self, spec: JobSpec, workspace: Path):
         """创建Kubernetes Job清单"""
-        import kubernetes.client as client
-        
-        # 规范化镜像引用（与 DockerExecutor 保持一致，未带 tag 则默认 latest）
-        def _parse_repo_tag(ref: str):
-            try:
-                from docker.utils import utils as docker_utils  # type: ignore
-                repo, tag = docker_utils.parse_repository_tag(ref)
-                return repo, tag
-            except Exception:
-                slash = ref.rfind('/')
-                colon = ref.rfind(':')
-                if colon > slash:
-                    return ref[:colon], ref[colon + 1:]
-                return ref, None
-        repo, tag = _parse_repo_tag(spec.container.image)
+        client = _get_kubernetes().client
+
+        # 规范化镜像引用（与 DockerExecutor 共用 base.parse_repo_tag）
+        repo, tag = parse_repo_tag(spec.container.image)
         normalized_ref = f"{repo}:{tag or 'latest'}"
         
         # 容器规范
@@ -118,9 +124,10 @@ class K8sExecutor(Executor):
             name="autoscorer-job",
             image=normalized_ref,
             command=spec.container.cmd or [],
+            # env 可能为 None（meta.json 未配置时），空 dict 兜底
             env=[
-                client.V1EnvVar(name=k, value=v) 
-                for k, v in spec.container.env.items()
+                client.V1EnvVar(name=k, value=v)
+                for k, v in (spec.container.env or {}).items()
             ],
             resources=client.V1ResourceRequirements(
                 requests={
@@ -199,32 +206,43 @@ class K8sExecutor(Executor):
         return job
     
     def _wait_for_job_completion(self, batch_v1, job_name: str, timeout: int = 1800):
-        """等待Job完成(简化实现)"""
+        """等待Job完成：watch 流式订阅 Job 状态，事件到达即返回。
+
+        相比每 5 秒 read_namespaced_job 轮询，省掉完成后最多 5 秒的
+        尾延迟与长任务期间的全部空轮询；wall-clock 超时仍作兜底。
+        """
         import time
-        
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            w = kubernetes.watch.Watch()
             try:
-                job = batch_v1.read_namespaced_job(
-                    name=job_name,
-                    namespace=self.namespace
-                )
-                
-                if job.status.succeeded:
-                    logger.info(f"Job {job_name} completed successfully")
-                    return
-                elif job.status.failed:
-                    raise AutoscorerError(
-                        code="K8S_JOB_FAILED",
-                        message=f"Job {job_name} failed"
-                    )
-                
-                time.sleep(5)  # 每5秒检查一次
-                
+                for event in w.stream(
+                        batch_v1.list_namespaced_job,
+                        namespace=self.namespace,
+                        field_selector=f"metadata.name={job_name}",
+                        timeout_seconds=int(remaining)):
+                    status = event["object"].status
+                    if status.succeeded:
+                        logger.info(f"Job {job_name} completed successfully")
+                        return
+                    if status.failed:
+                        raise AutoscorerError(
+                            code="K8S_JOB_FAILED",
+                            message=f"Job {job_name} failed"
+                        )
+            except AutoscorerError:
+                raise
             except Exception as e:
-                logger.error(f"Error checking job status: {e}")
+                # watch 断流（apiserver 滚动、连接重置等）后退避重连
+                logger.error(f"Error watching job status: {e}")
                 time.sleep(5)
-        
+            finally:
+                w.stop()
+
         # 超时
         raise AutoscorerError(
             code="K8S_JOB_TIMEOUT",
@@ -8,7 +8,6 @@ from autoscorer.scheduler import Scheduler
 from autoscorer.executor.docker_executor import DockerExecutor
 from autoscorer.scorers.registry import get_scorer, load_scorer_directory, get_scorer_class
 # Ensure static scorer registration is performed even when called outside CLI/API
-from autoscorer import scorers as _builtin_scorers  # noqa: F401
 from autoscorer.utils.errors import AutoscorerError, make_error
 from autoscorer.utils.logger import get_logger
 from autoscorer.utils.artifacts import ArtifactManager
@@ -1,8 +1,9 @@
 from __future__ import annotations
+import functools
 from pathlib import Path
 from typing import Dict, Optional, List
 from pydantic import BaseModel, Field
-import json
+import orjson
 
 
 class Resources(BaseModel):
@@ -33,7 +34,19 @@ class JobSpec(BaseModel):
     @staticmethod
     def from_workspace(ws: Path) -> "JobSpec":
         meta_path = ws / "meta.json"
-        if not meta_path.exists():
+        try:
+            st = meta_path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"meta.json not found in {ws}")
-        data = json.loads(meta_path.read_text())
-        return JobSpec(**data)
+        # (mtime_ns, size) 进缓存键：文件一变即自动失效；返回深拷贝，
+        # 调用方改写字段（如 scorer_override）不会污染缓存
+        spec = _cached_jobspec(str(meta_path), st.st_mtime_ns, st.st_size)
+        return spec.model_copy(deep=True)
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_jobspec(meta_path: str, _mtime_ns: int, _size: int) -> JobSpec:
+    """解析并校验 meta.json（orjson 直接吃 bytes），同一文件未变更时
+    validate/run/score 连续调用只付一次解析+pydantic 校验成本。"""
+    data = orjson.loads(Path(meta_path).read_bytes())
+    return JobSpec(**data)
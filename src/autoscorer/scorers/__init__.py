@@ -1,5 +1,4 @@
 # scorers package
-from . import classification  # noqa: F401: side-effect to register classification scorers
-from . import regression  # noqa: F401: side-effect to register regression scorers
-from . import detection  # noqa: F401: side-effect to register detection scorers
-from . import text_event  # noqa: F401: side-effect to register text event analysis scorer
+# 内置 scorer 模块改为惰性注册：首次查询未命中或列举时才导入，
+# API/worker 冷启动不再为用不到的 scorer 付导入开销（模块列表见 __lazy__）
+__lazy__ = ("classification", "regression", "detection", "text_event")
@@ -1,6 +1,8 @@
 """
 Scorer注册表系统，支持静态注册和动态热注册
 """
+import hashlib
+import os
 import importlib.util
 import sys
 import threading
@@ -10,17 +12,35 @@ from typing import Dict, Type, Optional, Any, List
 import inspect
 import logging
 
+# watchfiles（随 uvicorn[standard] 提供）封装了 inotify/FSEvents/ReadDirectoryChangesW，
+# 事件驱动 + 自带合并窗口；不可用时回退到轮询
+try:
+    from watchfiles import watch as _watchfiles_watch
+except ImportError:  # pragma: no cover - 可选依赖保护
+    _watchfiles_watch = None
+
 logger = logging.getLogger(__name__)
 
 class ScorerRegistry:
     """Scorer注册表，支持静态和动态注册，线程安全"""
     
-    def __init__(self):
+    def __init__(self, batch_window: float = 0.1):
         self._scorers: Dict[str, Type] = {}
-        self._loaded_files: Dict[str, float] = {}  # 文件路径 -> 修改时间
+        self._loaded_files: Dict[str, tuple] = {}  # 文件路径 -> (mtime_ns, size)
         self._lock = threading.RLock()  # 线程安全锁
         self._watchers: Dict[str, threading.Thread] = {}  # 文件监控线程
+        self._stop_events: Dict[str, threading.Event] = {}  # 监控线程停止信号
         self._watch_enabled = True
+        self._file_digests: Dict[str, bytes] = {}  # 文件路径 -> 内容摘要（重载去重）
+        self._last_loaded: Dict[str, Dict[str, Type]] = {}  # 文件路径 -> 上次加载结果
+        self._reload_locks: Dict[str, threading.Lock] = {}  # 按路径串行化重载
+        self._pending_reloads: Dict[str, set] = {}  # 包根目录 -> 待重载文件集合
+        self._reload_timers: Dict[str, threading.Timer] = {}  # 包根目录 -> 合并窗口定时器
+        # 尾沿去抖窗口：编辑器原子保存（rename 替换）会在几毫秒内触发
+        # 多个事件，窗口内的事件合并为一次重载；每次新事件重置计时器
+        self._batch_window = batch_window
+        self._rev = 0  # 注册表版本号：注册/注销/监控变化时递增，供快照缓存失效
+        self._reload_listeners: List[Any] = []  # 文件重载后回调（上层缓存失效用）
     
     def register(self, name: str, scorer_class: Type) -> None:
         """注册scorer类"""
@@ -30,7 +50,8 @@ class ScorerRegistry:
         with self._lock:
             old_class = self._scorers.get(name)
             self._scorers[name] = scorer_class
-            
+            self._rev += 1
+
             if old_class != scorer_class:
                 logger.info(f"Registered scorer: {name} -> {scorer_class.__name__}")
                 if old_class:
@@ -58,6 +79,7 @@ class ScorerRegistry:
         with self._lock:
             if name in self._scorers:
                 del self._scorers[name]
+                self._rev += 1
                 logger.info(f"Unregistered scorer: {name}")
                 return True
             return False
@@ -66,6 +88,7 @@ class ScorerRegistry:
         """清空所有scorer"""
         with self._lock:
             self._scorers.clear()
+            self._rev += 1
             logger.info("Cleared all scorers")
     
     def load_from_file(self, file_path: str, force_reload: bool = False) -> Dict[str, Type]:
@@ -85,15 +108,16 @@ class ScorerRegistry:
         if not path.suffix == '.py':
             raise ValueError(f"File must be a Python file: {file_path}")
         
-        # 检查文件是否需要重新加载
-        current_mtime = path.stat().st_mtime
-        if not force_reload and file_path in self._loaded_files:
-            if self._loaded_files[file_path] >= current_mtime:
-                logger.debug(f"Scorer file {file_path} already loaded and not modified")
-                return {}
-        
+        # 检查文件是否需要重新加载：(mtime_ns, size) 未变则命中缓存，
+        # 直接返回上次的加载结果（字典查找 vs 重新 exec 模块）
+        st = path.stat()
+        sig = (st.st_mtime_ns, st.st_size)
+        if not force_reload and self._loaded_files.get(file_path) == sig:
+            logger.debug(f"Scorer file {file_path} already loaded and not modified")
+            return self._last_loaded.get(file_path, {})
+
         # 动态加载模块
-        module_name = f"dynamic_scorer_{path.stem}_{int(current_mtime)}"
+        module_name = f"dynamic_scorer_{path.stem}_{st.st_mtime_ns}"
         spec = importlib.util.spec_from_file_location(module_name, path)
         if spec is None or spec.loader is None:
             raise ImportError(f"Cannot load module from {file_path}")
@@ -124,8 +148,31 @@ class ScorerRegistry:
                 loaded_scorers[scorer_name] = obj
                 logger.info(f"Auto-registered scorer from {file_path}: {scorer_name}")
         
-        self._loaded_files[file_path] = current_mtime
+        self._loaded_files[file_path] = sig
+        if loaded_scorers:
+            self._last_loaded[file_path] = loaded_scorers
+        # 模块真正重新 exec 过（缓存命中在上面已提前返回）：通知监听者，
+        # 让旧类对应的上层缓存（如 API 的实例缓存）失效
+        self._notify_reload(file_path)
         return loaded_scorers
+
+    def add_reload_listener(self, callback) -> None:
+        """注册文件重载回调：文件重新 exec 后以 file_path 调用。
+
+        watcher 触发、force_reload、显式 reload 端点都走 load_from_file，
+        上层缓存在此统一失效，不必覆盖每条重载路径。"""
+        with self._lock:
+            if callback not in self._reload_listeners:
+                self._reload_listeners.append(callback)
+
+    def _notify_reload(self, file_path: str) -> None:
+        with self._lock:
+            listeners = list(self._reload_listeners)
+        for cb in listeners:
+            try:
+                cb(file_path)
+            except Exception as e:
+                logger.error(f"Reload listener failed for {file_path}: {e}")
     
     def load_from_directory(self, dir_path: str, pattern: str = "*.py") -> Dict[str, Type]:
         """从目录批量加载scorer文件
@@ -153,22 +200,99 @@ class ScorerRegistry:
         return loaded_scorers
     
     def reload_file(self, file_path: str) -> Dict[str, Type]:
-        """重新加载指定文件的scorer"""
-        return self.load_from_file(file_path, force_reload=True)
+        """重新加载指定文件的scorer
+
+        编辑器保存/git pull 常对同一文件触发多次事件；按内容摘要去重，
+        内容没变就直接返回上次的加载结果，不再重新 exec 模块。
+        并发重载按路径加锁串行化。
+        """
+        with self._lock:
+            path_lock = self._reload_locks.setdefault(file_path, threading.Lock())
+        with path_lock:
+            try:
+                digest = hashlib.blake2b(Path(file_path).read_bytes(), digest_size=16).digest()
+            except OSError:
+                digest = None
+            if digest is not None and digest == self._file_digests.get(file_path):
+                logger.debug(f"Scorer file content unchanged, skipping reload: {file_path}")
+                return self._last_loaded.get(file_path, {})
+            loaded = self.load_from_file(file_path, force_reload=True)
+            if digest is not None:
+                self._file_digests[file_path] = digest
+            if loaded:
+                self._last_loaded[file_path] = loaded
+            return loaded
     
+    def _pkg_root(self, file_path: str) -> str:
+        """返回文件所属 scorer 包的根目录（向上走到最外层含 __init__.py 的目录）。
+
+        单文件 scorer 的包根就是其所在目录。
+        """
+        d = Path(file_path).resolve().parent
+        while (d / '__init__.py').exists() and (d.parent / '__init__.py').exists() and d.parent != d:
+            d = d.parent
+        return str(d)
+
+    def _schedule_reload(self, file_path: str) -> None:
+        """把一次文件变更事件并入所属包的重载批次。
+
+        保存多文件 scorer 包时，每个文件各触发一次事件；按包根目录
+        分桶并用 100ms 滑动窗口合并，窗口关闭后统一重载一轮。未变化
+        的同包文件由 reload_file 的内容摘要门挡掉，不会重复 exec。
+        """
+        root = self._pkg_root(file_path)
+        with self._lock:
+            self._pending_reloads.setdefault(root, set()).add(file_path)
+            timer = self._reload_timers.get(root)
+            if timer is not None:
+                timer.cancel()
+            timer = threading.Timer(self._batch_window, self._flush_reloads, args=(root,))
+            timer.daemon = True
+            self._reload_timers[root] = timer
+            timer.start()
+
+    def _flush_reloads(self, root: str) -> None:
+        with self._lock:
+            pending = self._pending_reloads.pop(root, set())
+            self._reload_timers.pop(root, None)
+        for fp in sorted(pending):
+            try:
+                self.reload_file(fp)
+            except Exception as e:
+                logger.error(f"Failed to reload {fp}: {e}")
+
     def start_watching(self, file_path: str, check_interval: float = 1.0) -> None:
-        """开始监控文件变化并自动重新加载"""
+        """开始监控文件变化并自动重新加载
+
+        优先使用 watchfiles（inotify 等 OS 原生事件 + 50ms 合并窗口）：
+        空闲零 CPU，重载延迟从 O(check_interval) 降到毫秒级；
+        watchfiles 不可用时回退到按 check_interval 轮询 mtime。
+        """
         if not self._watch_enabled:
             return
-            
+
         if file_path in self._watchers:
             logger.warning(f"Already watching file: {file_path}")
             return
-        
-        def watch_file():
-            logger.info(f"Started watching file: {file_path}")
+
+        stop_event = threading.Event()
+
+        def watch_file_events():
+            logger.info(f"Started watching file (native events): {file_path}")
+            try:
+                # 编辑器保存常触发 2-5 个事件，50ms 步进合并成一次重载
+                for _changes in _watchfiles_watch(file_path, stop_event=stop_event, debounce=500, step=50):
+                    if not self._watch_enabled or file_path not in self._watchers:
+                        break
+                    logger.info(f"File changed, scheduling reload: {file_path}")
+                    self._schedule_reload(file_path)
+            except Exception as e:
+                logger.error(f"Error watching file {file_path}: {e}")
+
+        def watch_file_polling():
+            logger.info(f"Started watching file (polling): {file_path}")
             last_mtime = 0
-            
+
             while self._watch_enabled and file_path in self._watchers:
                 try:
                     path = Path(file_path)
@@ -176,33 +300,44 @@ class ScorerRegistry:
                         current_mtime = path.stat().st_mtime
                         if current_mtime > last_mtime:
                             if last_mtime > 0:  # 不在首次检查时重新加载
-                                logger.info(f"File changed, reloading: {file_path}")
-                                try:
-                                    self.reload_file(file_path)
-                                except Exception as e:
-                                    logger.error(f"Failed to reload {file_path}: {e}")
+                                logger.info(f"File changed, scheduling reload: {file_path}")
+                                self._schedule_reload(file_path)
                             last_mtime = current_mtime
-                    
-                    time.sleep(check_interval)
+
+                    if stop_event.wait(check_interval):
+                        break
                 except Exception as e:
                     logger.error(f"Error watching file {file_path}: {e}")
-                    time.sleep(check_interval)
-        
-        thread = threading.Thread(target=watch_file, daemon=True)
+                    if stop_event.wait(check_interval):
+                        break
+
+        target = watch_file_events if _watchfiles_watch is not None else watch_file_polling
+        thread = threading.Thread(target=target, daemon=True)
         self._watchers[file_path] = thread
+        self._stop_events[file_path] = stop_event
         thread.start()
-    
+        with self._lock:
+            self._rev += 1
+
     def stop_watching(self, file_path: str) -> bool:
         """停止监控指定文件"""
         if file_path in self._watchers:
             del self._watchers[file_path]
+            with self._lock:
+                self._rev += 1
+            event = self._stop_events.pop(file_path, None)
+            if event is not None:
+                event.set()
             logger.info(f"Stopped watching file: {file_path}")
             return True
         return False
-    
+
     def stop_all_watching(self) -> None:
         """停止所有文件监控"""
         self._watch_enabled = False
+        for event in self._stop_events.values():
+            event.set()
+        self._stop_events.clear()
         self._watchers.clear()
         logger.info("Stopped all file watching")
     
@@ -210,8 +345,47 @@ class ScorerRegistry:
         """获取正在监控的文件列表"""
         return list(self._watchers.keys())
 
+    @property
+    def revision(self) -> int:
+        """注册表当前版本号（任何注册/注销/监控变化都会递增）。"""
+        with self._lock:
+            return self._rev
+
+def _configured_batch_window() -> float:
+    """全局实例的去抖窗口：WATCH_DEBOUNCE_WINDOW（秒，env 或 config.yaml）。
+
+    Config.get 优先读环境变量，部署侧无需改配置文件即可调窗口。"""
+    try:
+        from autoscorer.utils.config import Config
+        return float(Config().get("WATCH_DEBOUNCE_WINDOW", 0.1))
+    except Exception:
+        return float(os.environ.get("WATCH_DEBOUNCE_WINDOW", 0.1))
+
+
 # 全局注册表实例
-_registry = ScorerRegistry()
+_registry = ScorerRegistry(batch_window=_configured_batch_window())
+
+# 内置 scorer 的惰性注册：导入 autoscorer.scorers 包不再触发各
+# scorer 模块的 @register 副作用，首次未命中查询/列举时才批量导入，
+# 冷启动省掉用不到的重依赖（sklearn、matplotlib 等）
+_builtins_loaded = False
+_builtins_lock = threading.Lock()
+
+def _ensure_builtins_loaded() -> None:
+    global _builtins_loaded
+    if _builtins_loaded:
+        return
+    with _builtins_lock:
+        if _builtins_loaded:
+            return
+        import importlib
+        pkg = importlib.import_module("autoscorer.scorers")
+        for mod in getattr(pkg, "__lazy__", ()):
+            try:
+                importlib.import_module(f"autoscorer.scorers.{mod}")
+            except Exception as e:
+                logger.error(f"Failed to import builtin scorer module {mod}: {e}")
+        _builtins_loaded = True
 
 def register(name: str):
     """装饰器：注册scorer类"""
@@ -222,14 +396,21 @@ def register(name: str):
 
 def get_scorer(name: str):
     """获取scorer实例"""
+    if _registry.get(name) is None:
+        _ensure_builtins_loaded()
     return _registry.get_instance(name)
 
 def get_scorer_class(name: str) -> Optional[Type]:
     """获取scorer类"""
-    return _registry.get(name)
+    cls = _registry.get(name)
+    if cls is None:
+        _ensure_builtins_loaded()
+        cls = _registry.get(name)
+    return cls
 
 def list_scorers() -> Dict[str, str]:
     """列出所有scorer"""
+    _ensure_builtins_loaded()
     return _registry.list_scorers()
 
 def load_scorer_file(file_path: str, force_reload: bool = False) -> Dict[str, Type]:
@@ -244,6 +425,10 @@ def reload_scorer_file(file_path: str) -> Dict[str, Type]:
     """重新加载scorer文件"""
     return _registry.reload_file(file_path)
 
+def add_reload_listener(callback) -> None:
+    """注册文件重载回调（文件重新 exec 后以 file_path 调用）"""
+    _registry.add_reload_listener(callback)
+
 def start_watching_file(file_path: str, check_interval: float = 1.0) -> None:
     """开始监控文件变化"""
     _registry.start_watching(file_path, check_interval)
@@ -256,10 +441,29 @@ def get_watched_files() -> List[str]:
     """获取监控的文件列表"""
     return _registry.get_watched_files()
 
+def registry_revision() -> int:
+    """注册表版本号（用于缓存失效判断）。
+
+    先确保内置评分器已加载：否则冷启动时快照会以加载前的版本号
+    构建一次、紧接着因注册又失效，白做一轮。"""
+    _ensure_builtins_loaded()
+    return _registry.revision
+
+def watch_backend() -> str:
+    """当前文件监控机制：watchfiles（OS 原生事件）或 polling（mtime 轮询）"""
+    return "watchfiles" if _watchfiles_watch is not None else "polling"
+
 def get_scorer_registry() -> Dict[str, Type]:
     """获取所有已注册的评分器类（兼容旧API）"""
+    _ensure_builtins_loaded()
     return _registry._scorers.copy()
 
+
+# 生产环境可设 EAGER_SCORER_LOAD=true 换回启动时注册（偏好热进程、
+# 避免首个请求付导入延迟时使用）
+if os.getenv("EAGER_SCORER_LOAD", "").lower() in ("1", "true", "yes"):
+    _ensure_builtins_loaded()
+
 # 获取全局注册表实例，用于API管理
 def get_registry() -> ScorerRegistry:
     """获取全局注册表实例"""
@@ -0,0 +1,87 @@
+from __future__ import annotations
+import hashlib
+from typing import Any, Optional
+
+# 基于 Redis SET NX 的 workspace 去重锁：
+# /submit 用 O(1) 原子操作判断同一工作区是否已有任务在跑，
+# 取代向所有 worker 广播 inspect().active() 的控制总线往返。
+# Redis 不可用时所有操作静默降级为"无去重"。
+
+try:
+    import redis as _redis
+except ImportError:  # pragma: no cover - 可选依赖保护
+    _redis = None
+
+_client: Optional[Any] = None
+
+
+def workspace_key(workspace: str) -> str:
+    """workspace 去重键（哈希避免超长/含特殊字符的路径作键）。"""
+    digest = hashlib.blake2b(workspace.encode("utf-8"), digest_size=12).hexdigest()
+    return f"autoscorer:ws:{digest}"
+
+
+def get_client(cfg: Optional[Any] = None):
+    """惰性创建进程级 Redis 客户端（复用 Celery broker 地址）。"""
+    global _client
+    if _client is None and _redis is not None:
+        url = "redis://localhost:6379/0"
+        if cfg is not None:
+            try:
+                url = cfg.get("CELERY_BROKER", url)
+            except Exception:
+                pass
+        try:
+            _client = _redis.Redis.from_url(url)
+        except Exception:
+            return None
+    return _client
+
+# 兜底 TTL：worker 异常退出没删键时，锁最迟此后自动失效
+DEFAULT_TTL = 3600
+
+
+def acquire(workspace: str, ttl: int = DEFAULT_TTL, cfg: Optional[Any] = None) -> tuple[bool, Optional[str]]:
+    """尝试占住 workspace 锁。
+
+    Returns:
+        (acquired, existing_task_id)：占锁成功返回 (True, None)；
+        已被占用返回 (False, 持锁任务ID或None)；Redis 不可用返回 (True, None)。
+    """
+    r = get_client(cfg)
+    if r is None:
+        return True, None
+    try:
+        key = workspace_key(workspace)
+        if r.set(key, "pending", nx=True, ex=ttl):
+            return True, None
+        existing = r.get(key)
+        if isinstance(existing, bytes):
+            existing = existing.decode("utf-8", errors="replace")
+        if existing == "pending":
+            existing = None  # 竞争窗口内尚未绑定任务ID
+        return False, existing
+    except Exception:
+        return True, None
+
+
+def bind(workspace: str, task_id: str, ttl: int = DEFAULT_TTL, cfg: Optional[Any] = None) -> None:
+    """把锁值从占位符替换为实际任务ID（仅当键仍存在时）。"""
+    r = get_client(cfg)
+    if r is None:
+        return
+    try:
+        r.set(workspace_key(workspace), task_id, xx=True, ex=ttl)
+    except Exception:
+        pass
+
+
+def release(workspace: str, cfg: Optional[Any] = None) -> None:
+    """任务终结时释放锁。"""
+    r = get_client(cfg)
+    if r is None:
+        return
+    try:
+        r.delete(workspace_key(workspace))
+    except Exception:
+        pass
@@ -1,8 +1,12 @@
 from __future__ import annotations
+import atexit
+import os
 import sqlite3
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Dict, Any
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import json
 
 
@@ -10,6 +14,12 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+_TERMINAL_STATES = ("SUCCESS", "FAILURE", "REVOKED")
+# 开始类状态：允许被任何后续状态覆盖，但反过来不允许它们覆盖终态
+# （STARTED 写入走线程池，可能排在终态写入之后才到达）
+_EARLY_STATES = ("SUBMITTED", "STARTED")
+
+
 class TaskStore:
     """轻量级基于 SQLite 的任务结果持久化。
 
@@ -54,6 +64,7 @@ class TaskStore:
         conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)  # autocommit
         conn.execute("PRAGMA journal_mode=WAL;")
         conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA temp_store=MEMORY;")
         return conn
 
     def _init_db(self) -> None:
@@ -73,6 +84,8 @@ class TaskStore:
                 )
                 """
             )
+            # /submit 去重回退路径按 workspace 查询
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_workspace ON tasks(workspace)")
 
     def upsert(
         self,
@@ -85,58 +98,80 @@ class TaskStore:
         error: Optional[Dict[str, Any]] = None,
         finished: bool = False,
     ) -> None:
+        with self._connect() as conn:
+            self._upsert_one(
+                conn, task_id,
+                action=action, workspace=workspace, state=state,
+                result=result, error=error, finished=finished,
+            )
+
+    def _upsert_one(
+        self,
+        conn: sqlite3.Connection,
+        task_id: str,
+        *,
+        action: Optional[str] = None,
+        workspace: Optional[str] = None,
+        state: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[Dict[str, Any]] = None,
+        finished: bool = False,
+    ) -> None:
+        """在给定连接上执行单条 upsert（供批量写入复用同一事务）。"""
         now = _utc_now_iso()
         result_json = json.dumps(result, ensure_ascii=False) if result is not None else None
         error_json = json.dumps(error, ensure_ascii=False) if error is not None else None
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT task_id FROM tasks WHERE task_id=?", (task_id,))
-            exists = cur.fetchone() is not None
-            if not exists:
-                cur.execute(
-                    """
-                    INSERT INTO tasks (task_id, action, workspace, state, result_json, error_json, created_at, updated_at, finished_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        task_id,
-                        action,
-                        workspace,
-                        state,
-                        result_json,
-                        error_json,
-                        now,
-                        now,
-                        now if finished else None,
-                    ),
-                )
-            else:
-                # 构建动态更新
-                fields = []
-                values = []
-                if action is not None:
-                    fields.append("action=?")
-                    values.append(action)
-                if workspace is not None:
-                    fields.append("workspace=?")
-                    values.append(workspace)
-                if state is not None:
-                    fields.append("state=?")
-                    values.append(state)
-                if result is not None:
-                    fields.append("result_json=?")
-                    values.append(result_json)
-                if error is not None:
-                    fields.append("error_json=?")
-                    values.append(error_json)
-                if finished:
-                    fields.append("finished_at=?")
-                    values.append(now)
-                fields.append("updated_at=?")
+        cur = conn.cursor()
+        cur.execute("SELECT state, finished_at FROM tasks WHERE task_id=?", (task_id,))
+        row = cur.fetchone()
+        if row is None:
+            cur.execute(
+                """
+                INSERT INTO tasks (task_id, action, workspace, state, result_json, error_json, created_at, updated_at, finished_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    task_id,
+                    action,
+                    workspace,
+                    state,
+                    result_json,
+                    error_json,
+                    now,
+                    now,
+                    now if finished else None,
+                ),
+            )
+        else:
+            # 迟到的开始状态不得把已完结的行降级回 STARTED/SUBMITTED
+            if state in _EARLY_STATES and (row[1] is not None or row[0] in _TERMINAL_STATES):
+                state = None
+            # 构建动态更新
+            fields = []
+            values = []
+            if action is not None:
+                fields.append("action=?")
+                values.append(action)
+            if workspace is not None:
+                fields.append("workspace=?")
+                values.append(workspace)
+            if state is not None:
+                fields.append("state=?")
+                values.append(state)
+            if result is not None:
+                fields.append("result_json=?")
+                values.append(result_json)
+            if error is not None:
+                fields.append("error_json=?")
+                values.append(error_json)
+            if finished:
+                fields.append("finished_at=?")
                 values.append(now)
-                values.append(task_id)
-                sql = f"UPDATE tasks SET {', '.join(fields)} WHERE task_id=?"
-                cur.execute(sql, tuple(values))
+            fields.append("updated_at=?")
+            values.append(now)
+            values.append(task_id)
+            sql = f"UPDATE tasks SET {', '.join(fields)} WHERE task_id=?"
+            cur.execute(sql, tuple(values))
 
     def get(self, task_id: str) -> Optional[Dict[str, Any]]:
         with self._connect() as conn:
@@ -161,3 +196,214 @@ class TaskStore:
                 "updated_at": row[7],
                 "finished_at": row[8],
             }
+
+    def get_running_by_workspace(self, workspace: str, max_age_s: int = 3600) -> Optional[str]:
+        """查询该 workspace 是否有未完成任务，返回其任务ID。
+
+        只看 max_age_s 内更新过的记录，worker 崩溃留下的孤儿行
+        不会永久阻塞后续提交。
+        """
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=max_age_s)).isoformat()
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT task_id FROM tasks
+                WHERE workspace=? AND state IN ('SUBMITTED', 'STARTED')
+                  AND finished_at IS NULL AND updated_at >= ?
+                ORDER BY updated_at DESC LIMIT 1
+                """,
+                (workspace, cutoff),
+            )
+            row = cur.fetchone()
+            return row[0] if row else None
+
+    def list_running(self, max_age_s: int = 3600) -> list:
+        """列出所有未完成任务的 (workspace, task_id)，供内存索引重建。"""
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=max_age_s)).isoformat()
+        with self._connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT workspace, task_id FROM tasks
+                WHERE workspace IS NOT NULL AND state IN ('SUBMITTED', 'STARTED')
+                  AND finished_at IS NULL AND updated_at >= ?
+                ORDER BY updated_at
+                """,
+                (cutoff,),
+            )
+            return cur.fetchall()
+
+
+class BufferedTaskStore:
+    """TaskStore 的写合并缓冲（write-behind）。
+
+    每次状态变更原本各自开连接、各自 fsync；突发提交时全部串行在
+    SQLite 写锁后面。缓冲层把更新按 task_id 合并（同一任务只保留
+    最终字段集），由后台线程每 flush_interval 秒或攒满 max_batch 条
+    时在单个事务里批量落库，fsync 次数从每条一次降到每批一次。
+
+    读路径不走缓冲：WAL 允许并发读；get() 对有未落库更新的任务
+    先同步刷一次，保证读到自己的写。
+    """
+
+    def __init__(self, store: TaskStore, flush_interval: float = 0.02, max_batch: int = 256):
+        self._store = store
+        self._interval = flush_interval
+        self._max_batch = max_batch
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # workspace → 运行中任务ID 的内存反向索引：/submit 去重回退路径
+        # 从"按 workspace 扫索引"降为 O(1) 字典查找。启动时从库里重建
+        # 一次，之后随 upsert 的状态迁移维护（SUBMITTED/STARTED 记入，
+        # 终态或 finished 移除）。
+        self._ws_running: Dict[str, str] = {}
+        self._task_ws: Dict[str, str] = {}
+        try:
+            for ws, task_id in store.list_running():
+                self._ws_running[ws] = task_id
+                self._task_ws[task_id] = ws
+        except Exception:
+            pass
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._start_flusher()
+        atexit.register(self.flush)
+        # fork 出的子进程（如 Celery prefork worker）不会继承后台线程，
+        # 锁在 fork 瞬间也可能正被父进程某线程持有：子进程里全部重建，
+        # 否则子进程的 upsert 只进缓冲、永远不落库
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reinit_after_fork)
+
+    def _start_flusher(self) -> None:
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True, name="task-store-flush")
+        self._thread.start()
+
+    def _reinit_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._start_flusher()
+
+    @property
+    def db_path(self) -> str:
+        return self._store.db_path
+
+    def upsert(self, task_id: str, **kwargs: Any) -> None:
+        with self._lock:
+            cur = self._pending.get(task_id)
+            if cur is None:
+                cur = self._pending[task_id] = dict(kwargs)
+            else:
+                self._merge_into(cur, kwargs)
+            # 索引按合并结果维护：原始 kwargs 可能是被忽略的降级状态
+            self._update_ws_index(task_id, cur)
+            backlog = len(self._pending)
+        if backlog >= self._max_batch:
+            self._wake.set()
+
+    @staticmethod
+    def _merge_into(cur: Dict[str, Any], kwargs: Dict[str, Any]) -> None:
+        """把一次更新并入已有记录。
+
+        后到的非空字段覆盖先到的；finished 一旦为真即保持；迟到的
+        开始类状态不得把已完结的记录降级。"""
+        for k, v in kwargs.items():
+            if k == "finished":
+                cur[k] = bool(cur.get(k)) or bool(v)
+            elif v is not None:
+                if (k == "state" and v in _EARLY_STATES
+                        and (cur.get("finished") or cur.get("state") in _TERMINAL_STATES)):
+                    continue
+                cur[k] = v
+
+    def _update_ws_index(self, task_id: str, kwargs: Dict[str, Any]) -> None:
+        """随状态迁移维护 workspace 反向索引（调用方须持有 _lock）。"""
+        ws = kwargs.get("workspace")
+        if ws is not None:
+            self._task_ws[task_id] = ws
+        state = kwargs.get("state")
+        if state in ("SUBMITTED", "STARTED"):
+            ws = ws or self._task_ws.get(task_id)
+            if ws is not None:
+                self._ws_running[ws] = task_id
+        elif state in ("SUCCESS", "FAILURE", "REVOKED") or kwargs.get("finished"):
+            ws = self._task_ws.pop(task_id, None)
+            if ws is not None and self._ws_running.get(ws) == task_id:
+                del self._ws_running[ws]
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            dirty = task_id in self._pending
+        if dirty:
+            self.flush()
+        return self._store.get(task_id)
+
+    def get_running_by_workspace(self, workspace: str, max_age_s: int = 3600) -> Optional[str]:
+        with self._lock:
+            candidate = self._ws_running.get(workspace)
+        if candidate is not None:
+            # 命中后按主键回验一次：终态可能由 worker 进程直接写库，
+            # 本进程索引看不到该迁移
+            row = self.get(candidate)
+            if row and row["state"] in ("SUBMITTED", "STARTED") and row["finished_at"] is None:
+                return candidate
+            with self._lock:
+                self._task_ws.pop(candidate, None)
+                if self._ws_running.get(workspace) == candidate:
+                    del self._ws_running[workspace]
+        self.flush()
+        return self._store.get_running_by_workspace(workspace, max_age_s)
+
+    def flush(self) -> None:
+        """同步把所有待写更新落库（单事务）。"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, OrderedDict()
+            if not pending:
+                return
+            conn = self._store._connect()
+            try:
+                # IMMEDIATE：开事务即取写锁，避免读升级写时与并发
+                # 写者互相等待到 busy_timeout 才失败
+                conn.execute("BEGIN IMMEDIATE")
+                for task_id, kwargs in pending.items():
+                    self._store._upsert_one(conn, task_id, **kwargs)
+                conn.execute("COMMIT")
+            except Exception:
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+                # 落库失败（如跨进程争用下 SQLITE_BUSY 超过 busy_timeout）
+                # 不能把批次丢掉：终态/去重索引都依赖这些更新。把失败批
+                # 并回缓冲——期间新到的更新按原合并规则盖在旧值上——
+                # 交给 flush 循环下一轮重试
+                with self._lock:
+                    for task_id, kwargs in self._pending.items():
+                        base = pending.get(task_id)
+                        if base is not None:
+                            self._merge_into(base, kwargs)
+                        else:
+                            pending[task_id] = kwargs
+                    self._pending = pending
+                raise
+            finally:
+                conn.close()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        self.flush()
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self._interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # 落库失败不中断循环，下一轮重试（更新仍可能被后续覆盖合并）
+                pass
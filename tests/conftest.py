@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+# 仓库未以包形式安装时也能直接运行 pytest：
+# src/ 提供 autoscorer 包，仓库根提供 custom_scorers 示例包
+_ROOT = Path(__file__).resolve().parents[1]
+for _p in (str(_ROOT / "src"), str(_ROOT)):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
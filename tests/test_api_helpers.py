@@ -0,0 +1,63 @@
+"""API 纯函数助手：日志有界读取与 workspace 路径解析。"""
+import pytest
+
+pytest.importorskip("fastapi")
+
+from autoscorer.api import server
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    p = tmp_path / "container.log"
+    p.write_bytes(b"line1\nline2\nline3\nline4\n")
+    return p
+
+
+def test_read_log_slice_whole_file(log_file):
+    assert server._read_log_slice(log_file, None, None) == "line1\nline2\nline3\nline4\n"
+
+
+def test_read_log_slice_tail(log_file):
+    assert server._read_log_slice(log_file, None, 2) == "line3\nline4"
+
+
+def test_read_log_slice_tail_exceeds_file(log_file):
+    out = server._read_log_slice(log_file, None, 100)
+    assert out == "line1\nline2\nline3\nline4"
+
+
+def test_read_log_slice_offset(log_file):
+    assert server._read_log_slice(log_file, 6, None) == "line2\nline3\nline4\n"
+
+
+def test_read_log_slice_offset_past_end(log_file):
+    assert server._read_log_slice(log_file, 10_000, None) == ""
+
+
+def test_read_log_slice_tail_crosses_blocks(tmp_path):
+    # tail 的块回扫要跨 64KB 块边界仍只返回末尾 N 行
+    p = tmp_path / "big.log"
+    lines = [f"line-{i:06d}".encode() for i in range(20_000)]
+    p.write_bytes(b"\n".join(lines) + b"\n")
+    out = server._read_log_slice(p, None, 3)
+    assert out == "line-019997\nline-019998\nline-019999"
+
+
+def test_resolve_ws_missing_raises_oserror(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        server._resolve_ws(str(tmp_path / "missing"))
+
+
+def test_resolve_ws_not_a_directory_is_plain_oserror():
+    # /etc/passwd/foo 抛 NotADirectoryError：必须落在 OSError 分支
+    # （404），而不是 PermissionError（403）或全局 500
+    with pytest.raises(OSError) as excinfo:
+        server._resolve_ws("/etc/passwd/foo")
+    assert not isinstance(excinfo.value, PermissionError)
+
+
+def test_resolve_ws_ok(tmp_path):
+    paths = server._resolve_ws(str(tmp_path))
+    assert paths.root == tmp_path.resolve()
+    assert paths.container_log == paths.root / "logs" / "container.log"
+    assert paths.result_json == paths.root / "output" / "result.json"
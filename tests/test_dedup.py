@@ -0,0 +1,70 @@
+"""workspace 去重锁的 acquire/bind/release 生命周期。"""
+import pytest
+
+from autoscorer.utils import dedup
+
+
+class FakeRedis:
+    """仅覆盖去重锁用到的 SET NX/XX、GET、DELETE 语义。"""
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, xx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        if xx and key not in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def get(self, key):
+        value = self.data.get(key)
+        return value.encode() if isinstance(value, str) else value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(dedup, "_client", client)
+    return client
+
+
+def test_acquire_bind_release_lifecycle(fake_redis):
+    acquired, existing = dedup.acquire("/ws/1")
+    assert acquired and existing is None
+
+    # 占位期内的竞争提交：拿不到锁，任务ID尚未绑定
+    acquired, existing = dedup.acquire("/ws/1")
+    assert not acquired and existing is None
+
+    dedup.bind("/ws/1", "task-123")
+    acquired, existing = dedup.acquire("/ws/1")
+    assert not acquired and existing == "task-123"
+
+    dedup.release("/ws/1")
+    acquired, existing = dedup.acquire("/ws/1")
+    assert acquired and existing is None
+
+
+def test_bind_without_lock_is_noop(fake_redis):
+    # 键已过期/被释放时 bind（XX）不得重建锁
+    dedup.bind("/ws/1", "task-123")
+    assert fake_redis.data == {}
+
+
+def test_workspace_key_stable_and_distinct():
+    assert dedup.workspace_key("/ws/1") == dedup.workspace_key("/ws/1")
+    assert dedup.workspace_key("/ws/1") != dedup.workspace_key("/ws/2")
+
+
+def test_degrades_without_redis(monkeypatch):
+    monkeypatch.setattr(dedup, "_client", None)
+    monkeypatch.setattr(dedup, "_redis", None)
+    assert dedup.acquire("/ws/1") == (True, None)
+    # 不可用时 bind/release 静默成功
+    dedup.bind("/ws/1", "task-123")
+    dedup.release("/ws/1")
@@ -0,0 +1,57 @@
+"""示例评分器的核心路径：指标值必须与朴素实现一致。"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from custom_scorers.example_scorers import CustomMAEScorer, CustomMAPEScorer, _read_target
+
+
+def _write_csv(path, values, extra_cols=False):
+    lines = ["other,target" if extra_cols else "target"]
+    for v in values:
+        lines.append(f"x,{v}" if extra_cols else str(v))
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_read_target_is_float64(tmp_path):
+    # float32 会让 0.1 漂移成 0.10000000149…，评分结果不允许
+    f = tmp_path / "gt.csv"
+    _write_csv(f, [0.1, 0.2])
+    arr = _read_target(str(f))
+    assert arr.dtype == np.float64
+    assert float(arr[0]) == 0.1
+
+
+def test_read_target_projects_target_column(tmp_path):
+    f = tmp_path / "gt.csv"
+    _write_csv(f, [1.5, 2.5], extra_cols=True)
+    assert _read_target(str(f)).tolist() == [1.5, 2.5]
+
+
+def test_mae(tmp_path):
+    gt, pred = tmp_path / "gt.csv", tmp_path / "pred.csv"
+    _write_csv(gt, [1.0, 2.0, 3.0])
+    _write_csv(pred, [1.5, 2.0, 2.0])
+    out = CustomMAEScorer().score(str(gt), str(pred))
+    assert out["ok"]
+    assert out["summary"]["mae"] == pytest.approx(0.5)
+    assert out["details"]["samples"] == 3
+
+
+def test_mape_negative_ground_truth(tmp_path):
+    # gt=-4, pred=-5 必须贡献 +25%，不能带符号抵消其它行
+    gt, pred = tmp_path / "gt.csv", tmp_path / "pred.csv"
+    _write_csv(gt, [-4.0, 4.0])
+    _write_csv(pred, [-5.0, 5.0])
+    out = CustomMAPEScorer().score(str(gt), str(pred))
+    assert out["summary"]["mape"] == pytest.approx(25.0)
+
+
+def test_mape_skips_zero_ground_truth(tmp_path):
+    gt, pred = tmp_path / "gt.csv", tmp_path / "pred.csv"
+    _write_csv(gt, [0.0, 2.0])
+    _write_csv(pred, [1.0, 1.0])
+    out = CustomMAPEScorer().score(str(gt), str(pred))
+    assert out["summary"]["mape"] == pytest.approx(50.0)
+    assert out["details"]["valid_samples"] == 1
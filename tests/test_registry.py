@@ -0,0 +1,101 @@
+"""ScorerRegistry 的版本号、去抖窗口配置与重载回调。"""
+import time
+
+import pytest
+
+from autoscorer.scorers.registry import ScorerRegistry, _configured_batch_window
+
+
+class _DummyScorer:
+    def score(self, gt_path, pred_path):
+        return {}
+
+
+def test_revision_increments_on_register_and_unregister():
+    reg = ScorerRegistry()
+    rev0 = reg.revision
+    reg.register("dummy", _DummyScorer)
+    assert reg.revision == rev0 + 1
+    assert reg.unregister("dummy")
+    assert reg.revision == rev0 + 2
+
+
+def test_register_requires_score_method():
+    reg = ScorerRegistry()
+
+    class NoScore:
+        pass
+
+    with pytest.raises(ValueError):
+        reg.register("bad", NoScore)
+
+
+def test_batch_window_from_env(monkeypatch):
+    monkeypatch.setenv("WATCH_DEBOUNCE_WINDOW", "0.25")
+    assert _configured_batch_window() == 0.25
+
+
+def test_load_from_file_caches_unmodified(tmp_path):
+    f = tmp_path / "my_scorer.py"
+    f.write_text(
+        "class Demo:\n"
+        "    SCORER_NAME = 'demo_cached'\n"
+        "    def score(self, gt, pred): return {}\n"
+    )
+    reg = ScorerRegistry()
+    first = reg.load_from_file(str(f))
+    # (mtime, size) 未变：命中缓存，返回同一批类对象
+    second = reg.load_from_file(str(f))
+    assert first["demo_cached"] is second["demo_cached"]
+
+
+def test_reload_listener_fires_on_real_reload_only(tmp_path):
+    f = tmp_path / "my_scorer.py"
+    f.write_text(
+        "class Demo:\n"
+        "    SCORER_NAME = 'demo_reload'\n"
+        "    def score(self, gt, pred): return {}\n"
+    )
+    reg = ScorerRegistry()
+    seen = []
+    reg.add_reload_listener(seen.append)
+
+    reg.load_from_file(str(f))
+    assert seen == [str(f)]
+
+    # 首次 reload 建立内容摘要（会重新 exec 并通知）
+    reg.reload_file(str(f))
+    assert seen == [str(f)] * 2
+
+    # 内容未变的后续 reload：按摘要去重，不重新 exec 也不通知
+    reg.reload_file(str(f))
+    assert seen == [str(f)] * 2
+
+    time.sleep(0.01)  # 保证 mtime_ns 变化
+    f.write_text(
+        "class Demo:\n"
+        "    SCORER_NAME = 'demo_reload'\n"
+        "    def score(self, gt, pred): return {'v': 2}\n"
+    )
+    reg.reload_file(str(f))
+    assert seen == [str(f)] * 3
+
+
+def test_reload_replaces_registered_class(tmp_path):
+    f = tmp_path / "my_scorer.py"
+    f.write_text(
+        "class Demo:\n"
+        "    SCORER_NAME = 'demo_replace'\n"
+        "    def score(self, gt, pred): return {}\n"
+    )
+    reg = ScorerRegistry()
+    cls1 = reg.load_from_file(str(f))["demo_replace"]
+    time.sleep(0.01)
+    f.write_text(
+        "class Demo:\n"
+        "    SCORER_NAME = 'demo_replace'\n"
+        "    def score(self, gt, pred): return {'v': 2}\n"
+    )
+    cls2 = reg.reload_file(str(f))["demo_replace"]
+    assert cls1 is not cls2
+    assert reg.get("demo_replace") is cls2
@@ -0,0 +1,96 @@
+"""BufferedTaskStore 的合并/终态保护/失败重试不变量。"""
+import sqlite3
+
+import pytest
+
+from autoscorer.utils.task_store import TaskStore, BufferedTaskStore
+
+
+@pytest.fixture
+def buf(tmp_path):
+    store = TaskStore(str(tmp_path / "tasks.db"))
+    # 间隔拉长到不会自动触发，由测试显式 flush 控制批次边界
+    b = BufferedTaskStore(store, flush_interval=60)
+    yield b
+    b.close()
+
+
+def test_merge_later_fields_win(buf):
+    buf.upsert("t1", action="run", workspace="/ws/1", state="SUBMITTED")
+    buf.upsert("t1", state="STARTED")
+    buf.flush()
+    row = buf.get("t1")
+    assert row["state"] == "STARTED"
+    assert row["workspace"] == "/ws/1"
+    assert row["finished_at"] is None
+
+
+def test_merge_finished_is_sticky(buf):
+    buf.upsert("t1", action="run", workspace="/ws/1", state="SUCCESS", finished=True)
+    buf.upsert("t1", result={"score": 1.0})
+    buf.flush()
+    row = buf.get("t1")
+    assert row["finished_at"] is not None
+    assert row["state"] == "SUCCESS"
+
+
+def test_late_started_does_not_demote_in_buffer(buf):
+    # STARTED 写入走线程池，可能排在终态之后才到达同一批
+    buf.upsert("t1", action="run", workspace="/ws/1", state="SUCCESS", result={"ok": 1}, finished=True)
+    buf.upsert("t1", state="STARTED")
+    buf.flush()
+    row = buf.get("t1")
+    assert row["state"] == "SUCCESS"
+    assert row["finished_at"] is not None
+
+
+def test_late_started_does_not_demote_across_batches(buf):
+    # 终态已落库，迟到的 STARTED 在下一批才到：SQL 层同样不得降级
+    buf.upsert("t1", action="run", workspace="/ws/1", state="FAILURE", error={"code": "X"}, finished=True)
+    buf.flush()
+    buf.upsert("t1", state="STARTED")
+    buf.flush()
+    row = buf.get("t1")
+    assert row["state"] == "FAILURE"
+    assert row["finished_at"] is not None
+
+
+def test_ws_index_tracks_running_and_terminal(buf):
+    buf.upsert("t1", action="run", workspace="/ws/1", state="SUBMITTED")
+    assert buf.get_running_by_workspace("/ws/1") == "t1"
+    buf.upsert("t1", state="SUCCESS", finished=True)
+    buf.flush()
+    assert buf.get_running_by_workspace("/ws/1") is None
+
+
+def test_ignored_demotion_does_not_resurrect_ws_index(buf):
+    buf.upsert("t1", action="run", workspace="/ws/1", state="SUCCESS", finished=True)
+    buf.upsert("t1", state="STARTED")  # 被合并规则忽略
+    buf.flush()
+    assert buf.get_running_by_workspace("/ws/1") is None
+
+
+def test_failed_flush_requeues_batch(buf):
+    buf.upsert("t1", action="run", workspace="/ws/1", state="SUCCESS", result={"ok": 1}, finished=True)
+
+    store = buf._store
+    orig_connect = store._connect
+
+    class _BoomConn:
+        def execute(self, *args):
+            raise sqlite3.OperationalError("database is locked")
+
+        def close(self):
+            pass
+
+    store._connect = lambda: _BoomConn()
+    with pytest.raises(sqlite3.OperationalError):
+        buf.flush()
+    # 批次必须回到缓冲而不是被丢掉
+    assert "t1" in buf._pending
+
+    store._connect = orig_connect
+    buf.flush()
+    row = buf.get("t1")
+    assert row["state"] == "SUCCESS"
+    assert row["finished_at"] is not None